@@ -9,15 +9,155 @@ Jarvis V7.0 Configuration
 """
 
 import os
-from dotenv import load_dotenv
+import sys
+import functools
+from dataclasses import dataclass
+from types import MappingProxyType
+from typing import Any, Callable, Mapping, Optional
 
-# 加载 .env 文件
-load_dotenv()
+from pydantic import BaseModel, Field, field_validator, model_validator
+
+# 加载 .env 文件（内置极简解析器，无需 python-dotenv）
+_DOTENV_PATH = os.environ.get(
+    "DOTENV_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), ".env")
+)
+
+
+def _load_env_file(path: str) -> None:
+    """
+    解析 KEY=VALUE 格式的 .env 文件并写入 os.environ（不覆盖已有变量）
+
+    支持 # 注释、export 前缀、成对引号，以及未加引号值后的 " #" 行内注释。
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            lines = f.read().splitlines()
+    except OSError:
+        return
+    for line in lines:
+        line = line.strip()
+        if not line or line[0] == "#" or "=" not in line:
+            continue
+        if line.startswith("export "):
+            line = line[7:].lstrip()
+        key, _, value = line.partition("=")
+        key, value = key.strip(), value.strip()
+        if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+            value = value[1:-1]
+        elif " #" in value:
+            value = value.split(" #", 1)[0].rstrip()
+        if key:
+            os.environ.setdefault(key, value)
+
+
+_load_env_file(_DOTENV_PATH)
+
+# 类体构建期间使用的环境变量快照（构建完成后在模块末尾删除）
+_ENV = os.environ.copy()
+_e = _ENV.get
+
+
+def _env_bool(key: str, default: str) -> bool:
+    return _e(key, default).lower() == "true"
+
+
+class RuntimeSettings(BaseModel):
+    """
+    运行时数值参数（启动时统一解析与校验）
+
+    环境变量名为字段名的大写形式，如 BROWSER_TASK_TIMEOUT。
+    非法取值在导入 config 时即报错，而不是在首次使用时才暴露。
+    """
+    wake_sensitivity: float = Field(default=0.7)
+    browser_task_timeout: int = Field(default=120, gt=0)
+    knowledge_chunk_size: int = Field(default=500, gt=0)
+    knowledge_chunk_overlap: int = Field(default=50, ge=0)
+    knowledge_max_results: int = Field(default=5, gt=0)
+    vad_pause_threshold: float = Field(default=0.8, gt=0.0)
+    vad_max_record_seconds: int = Field(default=30, gt=0)
+    max_history_messages: int = Field(default=30, gt=0)
+
+    @field_validator("wake_sensitivity", mode="before")
+    @classmethod
+    def _clamp_sensitivity(cls, value: Any) -> float:
+        # 唤醒词灵敏度保持宽松策略：越界则截断到 [0, 1]，无法解析则回退默认值
+        try:
+            return max(0.0, min(1.0, float(value)))
+        except (TypeError, ValueError):
+            return 0.7
+
+    @model_validator(mode="after")
+    def _check_chunking(self) -> "RuntimeSettings":
+        if self.knowledge_chunk_overlap >= self.knowledge_chunk_size:
+            raise ValueError("KNOWLEDGE_CHUNK_OVERLAP 必须小于 KNOWLEDGE_CHUNK_SIZE")
+        return self
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str]) -> "RuntimeSettings":
+        """从环境变量映射中读取已设置的字段"""
+        return cls.model_validate({
+            name: env[name.upper()]
+            for name in cls.model_fields
+            if name.upper() in env
+        })
+
+
+_SETTINGS = RuntimeSettings.from_env(_ENV)
+
+
+_VALID_PROVIDERS = ("openai", "ollama", "gemini")
+
+
+@dataclass(slots=True, frozen=True)
+class RoleConfig:
+    """
+    单个 LLM 角色的配置（不可变）
+
+    Attributes:
+        provider: "openai" / "ollama" / "gemini"
+        model: 模型名称
+        api_key: API Key（OpenAI 兼容接口或 Gemini）
+        base_url: OpenAI 兼容接口地址
+        host: Ollama 服务地址
+        timeout: 请求超时（秒）
+        fallback_model: Ollama/Gemini 不可用、回退到 OpenAI 兼容接口时使用的模型名
+    """
+    provider: str
+    model: str
+    api_key: Optional[str] = None
+    base_url: Optional[str] = None
+    host: Optional[str] = None
+    timeout: int = 60
+    fallback_model: Optional[str] = None
+
+    def __post_init__(self):
+        # 构建时即校验形状，避免错误配置一路传到首次 HTTP 调用才暴露
+        if self.provider not in _VALID_PROVIDERS:
+            raise ValueError(
+                f"LLM provider 无效: {self.provider!r}，可选值: {', '.join(_VALID_PROVIDERS)}"
+            )
+        if not self.model:
+            raise ValueError(f"LLM model 不能为空 (provider={self.provider})")
+        if not isinstance(self.timeout, int) or self.timeout < 1:
+            raise ValueError(f"LLM timeout 必须为 >= 1 的整数，当前为 {self.timeout!r}")
+
+
+class _classproperty:
+    """只读类属性描述符：Config.X 直接返回计算结果，而不是 property 对象"""
+
+    def __init__(self, fget: Callable):
+        self.fget = fget
+
+    def __get__(self, obj, owner):
+        return self.fget(owner)
 
 
 class Config:
     """Jarvis 统一配置类"""
     
+    # 仅作命名空间使用，实例不分配 __dict__
+    __slots__ = ()
+    
     # =========================================
     # 🎭 人格配置系统 (Personality System)
     # =========================================
@@ -26,7 +166,7 @@ class Config:
     PERSONALITY = {
         # 基础人格（所有模式共享）
         "base": {
-            "name": os.getenv("JARVIS_ASSISTANT_NAME", "Jarvis"),
+            "name": _e("JARVIS_ASSISTANT_NAME", "Jarvis"),
             "trait": "简洁、专业、友好",
             "language": "中文",
         },
@@ -34,12 +174,12 @@ class Config:
         # 语音模式约束（被朗读出来，必须简洁口语化）
         "voice_mode": {
             "style": "极度简洁，1-2句话解决问题，像朋友聊天",
-            "rules": [
+            "rules": (
                 "不要长篇大论，用户在听不是在看",
                 "不要使用 markdown、列表、代码块",
                 "不要分析过程，直接给结果",
                 "不要反问，除非真的需要澄清",
-            ],
+            ),
             "example_bad": "我看到您的屏幕上显示的是一个代码编辑器，可能是 VS Code，并且您刚刚执行了一个切换模型的操作...",
             "example_good": "屏幕上是 VS Code，打开了 main.py。",
         },
@@ -47,10 +187,10 @@ class Config:
         # 文字模式约束（可以适当详细）
         "text_mode": {
             "style": "清晰准确，可以适当详细，支持 markdown",
-            "rules": [
+            "rules": (
                 "可以使用格式化提高可读性",
                 "复杂问题可以分步骤解释",
-            ],
+            ),
         },
         
         # 角色特定人格补充
@@ -63,44 +203,50 @@ class Config:
         },
     }
     
-    # 兼容旧版：保留 PERSONALITY_PROMPT（从新配置生成）
+    # 兼容旧版：保留 PERSONALITY_PROMPT（类定义时由基础人格预先生成）
+    _BASE = PERSONALITY["base"]
+    PERSONALITY_PROMPT = f"""你是 {_BASE['name']}，一个智能 AI 助手。
+你的特点：{_BASE['trait']}
+使用{_BASE['language']}与用户交流。"""
+    del _BASE
+    
+    # 对外只暴露只读视图：调用方可直接共享，无需防御性拷贝
+    PERSONALITY = MappingProxyType({
+        section: MappingProxyType(values) for section, values in PERSONALITY.items()
+    })
+    
     @classmethod
     def get_personality_prompt(cls) -> str:
         """获取基础人格 Prompt（兼容旧代码）"""
-        base = cls.PERSONALITY.get("base", {})
-        return f"""你是 {base.get('name', 'Jarvis')}，一个智能 AI 助手。
-你的特点：{base.get('trait', '简洁、专业、友好')}
-使用{base.get('language', '中文')}与用户交流。"""
-    
-    # 保持向后兼容
-    PERSONALITY_PROMPT = property(lambda self: Config.get_personality_prompt())
+        return cls.PERSONALITY_PROMPT
     
     # 用户自定义名称（用于个性化称呼）
-    USER_NAME = os.getenv("JARVIS_USER_NAME", "主人")
+    USER_NAME = _e("JARVIS_USER_NAME", "主人")
     
     # 助手名称
-    ASSISTANT_NAME = os.getenv("JARVIS_ASSISTANT_NAME", "Jarvis")
+    ASSISTANT_NAME = _e("JARVIS_ASSISTANT_NAME", "Jarvis")
     
     # =========================================
     # 🌐 网络与代理配置
     # =========================================
-    PROXY_ENABLED = os.getenv("PROXY_ENABLED", "false").lower() == "true"
-    PROXY_URL = os.getenv("PROXY_URL", "http://127.0.0.1:7897")
+    PROXY_ENABLED = _env_bool("PROXY_ENABLED", "false")
+    PROXY_URL = _e("PROXY_URL", "http://127.0.0.1:7897")
+    # 加载后不可变，预先构建 httpx 代理字典
+    _PROXY_CONFIG = (
+        {"http://": PROXY_URL, "https://": PROXY_URL}
+        if PROXY_ENABLED and PROXY_URL else None
+    )
     
     # =========================================
     # 🎤 语音与唤醒词配置
     # =========================================
-    PICOVOICE_ACCESS_KEY = os.getenv("PICOVOICE_ACCESS_KEY")
-    USE_BUILTIN_KEYWORD = os.getenv("USE_BUILTIN_KEYWORD", "true").lower() == "true"
-    WAKE_WORD_FILE = os.getenv("WAKE_WORD_FILE", "jarvis.ppn")
-    TTS_VOICE = os.getenv("TTS_VOICE", "zh-CN-XiaoxiaoNeural")
+    PICOVOICE_ACCESS_KEY = _e("PICOVOICE_ACCESS_KEY")
+    USE_BUILTIN_KEYWORD = _env_bool("USE_BUILTIN_KEYWORD", "true")
+    WAKE_WORD_FILE = _e("WAKE_WORD_FILE", "jarvis.ppn")
+    TTS_VOICE = _e("TTS_VOICE", "zh-CN-XiaoxiaoNeural")
     
     # 唤醒词灵敏度 (0.0 - 1.0)
-    try:
-        WAKE_SENSITIVITY = float(os.getenv("WAKE_SENSITIVITY", "0.7"))
-        WAKE_SENSITIVITY = max(0.0, min(1.0, WAKE_SENSITIVITY))
-    except Exception:
-        WAKE_SENSITIVITY = 0.7
+    WAKE_SENSITIVITY = _SETTINGS.wake_sensitivity
 
     # =========================================
     # 🤖 LLM 角色配置 (V7.0 统一架构)
@@ -116,48 +262,88 @@ class Config:
     #
     # 如果本地模型不可用，自动回退到 default
     
-    LLM_ROLES = {
-        "default": {
-            "provider": "openai",
-            "api_key": os.getenv("DEFAULT_LLM_API_KEY"),
-            "base_url": os.getenv("DEFAULT_LLM_BASE_URL", "https://api.openai.com/v1"),
-            "model": os.getenv("DEFAULT_LLM_MODEL", "gpt-3.5-turbo"),
-            "timeout": 60,
-        },
-        "smart": {
-            "provider": "openai",
-            "api_key": os.getenv("SMART_LLM_API_KEY") or os.getenv("DEFAULT_LLM_API_KEY"),
-            "base_url": os.getenv("SMART_LLM_BASE_URL") or os.getenv("DEFAULT_LLM_BASE_URL"),
-            "model": os.getenv("SMART_LLM_MODEL", "gpt-4o"),
-            "timeout": 120,
-        },
-        "coder": {
-            "provider": os.getenv("CODER_LLM_PROVIDER", "ollama"),
-            "model": os.getenv("CODER_LLM_MODEL", "deepseek-coder:6.7b"),
-            "host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
-            "timeout": 180,
-            # OpenAI fallback (当 Ollama 不可用时使用)
-            "api_key": os.getenv("CODER_LLM_API_KEY") or os.getenv("DEFAULT_LLM_API_KEY"),
-            "base_url": os.getenv("CODER_LLM_BASE_URL") or os.getenv("DEFAULT_LLM_BASE_URL"),
-        },
-        "fast": {
-            "provider": os.getenv("FAST_LLM_PROVIDER", "ollama"),
-            "model": os.getenv("FAST_LLM_MODEL", "llama3:8b"),
-            "host": os.getenv("OLLAMA_HOST", "http://localhost:11434"),
-            "timeout": 60,
-            # OpenAI fallback
-            "api_key": os.getenv("FAST_LLM_API_KEY") or os.getenv("DEFAULT_LLM_API_KEY"),
-            "base_url": os.getenv("FAST_LLM_BASE_URL") or os.getenv("DEFAULT_LLM_BASE_URL"),
-        },
-        "vision": {
-            "provider": os.getenv("VISION_LLM_PROVIDER", "gemini"),
-            "api_key": os.getenv("VISION_LLM_API_KEY") or os.getenv("GEMINI_API_KEY"),
-            "model": os.getenv("VISION_LLM_MODEL", "gemini-1.5-flash"),
-            "timeout": 60,
-            # OpenAI fallback (如 GPT-4o)
-            "base_url": os.getenv("VISION_LLM_BASE_URL"),
-        },
-    }
+    @staticmethod
+    @functools.lru_cache(maxsize=1)
+    def _load_llm_roles() -> Mapping[str, RoleConfig]:
+        """
+        构建 LLM 角色配置（进程内只构建一次）
+
+        读取一次 os.environ 快照，返回只读视图，避免每次查询角色时重复分配字典。
+        """
+        env = os.environ.copy()
+
+        def getenv(name: str, default: Optional[str] = None) -> Optional[str]:
+            # .env 中留空的变量（如 .env.example 的 SMART_LLM_MODEL=）视为未设置
+            return env.get(name) or default
+
+        def role(name: str, **fields: Any) -> RoleConfig:
+            try:
+                return RoleConfig(**fields)
+            except ValueError as e:
+                prefix = f"{name.upper()}_LLM_"
+                raise ValueError(
+                    f"角色 '{name}' 配置无效（检查环境变量 {prefix}PROVIDER / {prefix}MODEL）: {e}"
+                ) from e
+
+        # provider/model 会在路由分发中反复比较，驻留后相等比较可走指针快路径
+        intern = sys.intern
+        # 多个角色共享的环境变量只读一次
+        default_key = getenv("DEFAULT_LLM_API_KEY")
+        default_url = getenv("DEFAULT_LLM_BASE_URL")
+        ollama_host = getenv("OLLAMA_HOST", "http://localhost:11434")
+        default_model = getenv("DEFAULT_LLM_MODEL", "gpt-3.5-turbo")
+        return MappingProxyType({
+            "default": role(
+                "default",
+                provider="openai",
+                api_key=default_key,
+                base_url=default_url if default_url is not None else "https://api.openai.com/v1",
+                model=intern(default_model),
+                timeout=60,
+            ),
+            "smart": role(
+                "smart",
+                provider="openai",
+                api_key=getenv("SMART_LLM_API_KEY") or default_key,
+                base_url=getenv("SMART_LLM_BASE_URL") or default_url,
+                model=intern(getenv("SMART_LLM_MODEL", "gpt-4o")),
+                timeout=120,
+            ),
+            "coder": role(
+                "coder",
+                provider=intern(getenv("CODER_LLM_PROVIDER", "ollama")),
+                model=intern(getenv("CODER_LLM_MODEL", "deepseek-coder:6.7b")),
+                host=ollama_host,
+                timeout=180,
+                # OpenAI fallback (当 Ollama 不可用时使用)
+                api_key=getenv("CODER_LLM_API_KEY") or default_key,
+                base_url=getenv("CODER_LLM_BASE_URL") or default_url,
+                fallback_model=getenv("CODER_LLM_FALLBACK_MODEL", default_model),
+            ),
+            "fast": role(
+                "fast",
+                provider=intern(getenv("FAST_LLM_PROVIDER", "ollama")),
+                model=intern(getenv("FAST_LLM_MODEL", "llama3:8b")),
+                host=ollama_host,
+                timeout=60,
+                # OpenAI fallback
+                api_key=getenv("FAST_LLM_API_KEY") or default_key,
+                base_url=getenv("FAST_LLM_BASE_URL") or default_url,
+                fallback_model=getenv("FAST_LLM_FALLBACK_MODEL", default_model),
+            ),
+            "vision": role(
+                "vision",
+                provider=intern(getenv("VISION_LLM_PROVIDER", "gemini")),
+                api_key=getenv("VISION_LLM_API_KEY") or getenv("GEMINI_API_KEY"),
+                model=intern(getenv("VISION_LLM_MODEL", "gemini-1.5-flash")),
+                timeout=60,
+                # OpenAI fallback (如 GPT-4o)
+                base_url=getenv("VISION_LLM_BASE_URL"),
+                fallback_model=getenv("VISION_LLM_FALLBACK_MODEL", default_model),
+            ),
+        })
+
+    LLM_ROLES = _classproperty(lambda cls: cls._load_llm_roles())
     
     # =========================================
     # ⚙️ 运行时参数 (Runtime Settings)
@@ -165,33 +351,40 @@ class Config:
     # 集中管理各模块的阈值和超时，避免硬编码
     
     # 浏览器自动化
-    BROWSER_TASK_TIMEOUT = int(os.getenv("BROWSER_TASK_TIMEOUT", "120"))  # 秒
+    BROWSER_TASK_TIMEOUT = _SETTINGS.browser_task_timeout  # 秒
     
     # 知识库 RAG
-    KNOWLEDGE_CHUNK_SIZE = int(os.getenv("KNOWLEDGE_CHUNK_SIZE", "500"))  # 字符
-    KNOWLEDGE_CHUNK_OVERLAP = int(os.getenv("KNOWLEDGE_CHUNK_OVERLAP", "50"))  # 字符
-    KNOWLEDGE_MAX_RESULTS = int(os.getenv("KNOWLEDGE_MAX_RESULTS", "5"))  # 条
+    KNOWLEDGE_CHUNK_SIZE = _SETTINGS.knowledge_chunk_size  # 字符
+    KNOWLEDGE_CHUNK_OVERLAP = _SETTINGS.knowledge_chunk_overlap  # 字符
+    KNOWLEDGE_MAX_RESULTS = _SETTINGS.knowledge_max_results  # 条
     
     # 语音识别 VAD
-    VAD_PAUSE_THRESHOLD = float(os.getenv("VAD_PAUSE_THRESHOLD", "0.8"))  # 秒
-    VAD_MAX_RECORD_SECONDS = int(os.getenv("VAD_MAX_RECORD_SECONDS", "30"))  # 秒
+    VAD_PAUSE_THRESHOLD = _SETTINGS.vad_pause_threshold  # 秒
+    VAD_MAX_RECORD_SECONDS = _SETTINGS.vad_max_record_seconds  # 秒
     
     # 对话历史
-    MAX_HISTORY_MESSAGES = int(os.getenv("MAX_HISTORY_MESSAGES", "30"))  # 条，防止 context 溢出
+    MAX_HISTORY_MESSAGES = _SETTINGS.max_history_messages  # 条，防止 context 溢出
     
-    @staticmethod
-    def get_proxy_config():
+    # 启动时后台预热当前角色的 LLM（创建客户端 + 绑定工具），降低首轮对话延迟
+    PREWARM_ENABLED = _env_bool("JARVIS_PREWARM", "true")
+    
+    @classmethod
+    def get_proxy_config(cls):
         """获取 httpx 兼容的代理配置字典"""
-        if Config.PROXY_ENABLED and Config.PROXY_URL:
-            return {
-                "http://": Config.PROXY_URL,
-                "https://": Config.PROXY_URL
-            }
-        return None
+        return cls._PROXY_CONFIG
 
-    @staticmethod
-    def setup_env_proxy():
-        """设置环境变量代理 (供 requests 等库使用)"""
-        if Config.PROXY_ENABLED and Config.PROXY_URL:
-            os.environ["http_proxy"] = Config.PROXY_URL
-            os.environ["https_proxy"] = Config.PROXY_URL
\ No newline at end of file
+    @classmethod
+    def setup_env_proxy(cls):
+        """设置环境变量代理 (供 requests 等库使用)，重复调用无副作用"""
+        if cls._PROXY_CONFIG and os.environ.get("http_proxy") != cls.PROXY_URL:
+            # 大写变体也一并设置：部分库只检查 HTTP_PROXY / HTTPS_PROXY
+            url = cls.PROXY_URL
+            os.environ.update({
+                "http_proxy": url,
+                "https_proxy": url,
+                "HTTP_PROXY": url,
+                "HTTPS_PROXY": url,
+            })
+
+
+del _ENV, _e, _env_bool, _SETTINGS
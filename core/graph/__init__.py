@@ -2,13 +2,34 @@
 LangGraph Core Module for Jarvis V7.0
 
 This module provides the graph-based agent architecture using LangGraph.
-"""
 
-from core.graph.state import AgentState
-from core.graph.builder import create_graph, graph
+Exports are resolved lazily (PEP 562) so that importing ``core.graph``
+does not pull in the LangGraph / LangChain import chain until a symbol
+is actually used.
+"""
 
 __all__ = [
     "AgentState",
     "create_graph",
     "graph",
 ]
+
+
+def __getattr__(name: str):
+    if name == "AgentState":
+        from core.graph.state import AgentState
+        globals()["AgentState"] = AgentState
+        return AgentState
+    if name == "create_graph":
+        from core.graph.builder import create_graph
+        globals()["create_graph"] = create_graph
+        return create_graph
+    if name == "graph":
+        # init_graph() 会重新绑定 builder.graph，这里不缓存，每次取最新值
+        from core.graph import builder
+        return builder.graph
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
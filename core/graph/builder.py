@@ -7,19 +7,23 @@ Phase 3 implements persistence and safety interceptor.
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import threading
+from collections import deque
 from typing import Optional, List, Sequence, Union, cast, Any
 from functools import lru_cache
 
 from langgraph.graph import StateGraph, START, END
 from langgraph.graph.state import CompiledStateGraph
-from langgraph.prebuilt import ToolNode, tools_condition
+from langgraph.prebuilt import ToolNode
 from langgraph.checkpoint.base import BaseCheckpointSaver
 from langchain_core.messages import AIMessage, SystemMessage, HumanMessage, ToolMessage, BaseMessage
+from langchain_core.runnables import Runnable
 from langchain_core.tools import BaseTool
 
 from core.graph.state import AgentState, NodeOutput
-from core.llm_provider import LLMFactory, RoleType
+from core.llm_provider import LLMFactory, RoleType, awarm_connection
 from config import Config
 
 # Import tools from centralized registry (single source of truth)
@@ -31,10 +35,69 @@ logger = logging.getLogger(__name__)
 
 # ============== Tool Registry ==============
 
-@lru_cache(maxsize=1)
-def _build_tool_registry() -> dict[str, BaseTool]:
-    """Build tool registry once and cache it."""
-    return {tool.name: tool for tool in get_all_tools()}
+# 工具列表在进程内基本不变：首次访问时构建一次，之后直接返回缓存引用
+_tool_cache_lock = threading.Lock()
+_ALL_TOOLS_CACHE: Optional[tuple[BaseTool, ...]] = None
+_SAFE_TOOLS_CACHE: Optional[tuple[BaseTool, ...]] = None
+_DANGEROUS_TOOLS_CACHE: Optional[tuple[BaseTool, ...]] = None
+
+# 名称索引：tool name -> tool / risk level（安全检查热路径只做一次字典查找）
+_TOOL_BY_NAME: dict[str, BaseTool] = {}
+_RISK_BY_NAME: dict[str, str] = {}
+
+# 每个角色绑定好工具的 LLM 缓存: role -> (llm, llm_with_tools)
+_LLM_WITH_TOOLS_CACHE: dict[str, tuple[Any, Runnable]] = {}
+# 只保护冷路径：prewarm 线程与首个请求可能同时构建同一角色
+_llm_with_tools_lock = threading.Lock()
+
+
+def _ensure_tool_cache() -> tuple[BaseTool, ...]:
+    """Populate the tool caches on first use (thread-safe)."""
+    global _ALL_TOOLS_CACHE, _SAFE_TOOLS_CACHE, _DANGEROUS_TOOLS_CACHE, _TOOL_BY_NAME, _RISK_BY_NAME
+    tools = _ALL_TOOLS_CACHE
+    if tools is not None:
+        return tools
+    with _tool_cache_lock:
+        if _ALL_TOOLS_CACHE is None:
+            all_tools = tuple(get_native_tools())
+            safe: list[BaseTool] = []
+            dangerous: list[BaseTool] = []
+            by_name: dict[str, BaseTool] = {}
+            risk_by_name: dict[str, str] = {}
+            # 单次遍历完成名称索引与安全/危险分区
+            for t in all_tools:
+                level = get_tool_risk_level(t)
+                by_name[t.name] = t
+                risk_by_name[t.name] = level
+                if level == "safe":
+                    safe.append(t)
+                elif level == "dangerous":
+                    dangerous.append(t)
+            _SAFE_TOOLS_CACHE = tuple(safe)
+            _DANGEROUS_TOOLS_CACHE = tuple(dangerous)
+            _TOOL_BY_NAME = by_name
+            _RISK_BY_NAME = risk_by_name
+            _ALL_TOOLS_CACHE = all_tools
+        return _ALL_TOOLS_CACHE
+
+
+def invalidate_tool_cache() -> None:
+    """
+    Rebuild all cached tool lists and name indexes, and drop per-role bound LLMs.
+    
+    Call this after changing the native tool set at runtime.
+    """
+    global _ALL_TOOLS_CACHE, _SAFE_TOOLS_CACHE, _DANGEROUS_TOOLS_CACHE
+    with _tool_cache_lock:
+        _ALL_TOOLS_CACHE = None
+        _SAFE_TOOLS_CACHE = None
+        _DANGEROUS_TOOLS_CACHE = None
+        _LLM_WITH_TOOLS_CACHE.clear()
+    _ensure_tool_cache()
+
+
+# 导入时即构建工具缓存与名称索引（tools 包已在模块顶部导入，不存在循环依赖）
+_ensure_tool_cache()
 
 
 def get_tool_by_name(name: str) -> Optional[BaseTool]:
@@ -47,37 +110,88 @@ def get_tool_by_name(name: str) -> Optional[BaseTool]:
     Returns:
         The tool instance or None if not found
     """
-    return _build_tool_registry().get(name)
+    return _TOOL_BY_NAME.get(name)
 
 
-def get_all_tools() -> List[BaseTool]:
+def get_all_tools() -> tuple[BaseTool, ...]:
     """
     Get all available native tools from centralized registry.
     
     Returns:
-        List of LangChain tool instances
+        Shared immutable tuple of LangChain tool instances
+        (use list(...) at the call site if mutation is needed)
     """
-    return get_native_tools()
+    return _ensure_tool_cache()
 
 
-def get_safe_tools() -> List[BaseTool]:
+def get_safe_tools() -> tuple[BaseTool, ...]:
     """
     Get only safe tools (risk_level == "safe").
     
     Returns:
-        List of safe tool instances
+        Tuple of safe tool instances
     """
-    return [t for t in get_all_tools() if get_tool_risk_level(t) == "safe"]
+    _ensure_tool_cache()
+    return _SAFE_TOOLS_CACHE or ()
 
 
-def get_dangerous_tools() -> List[BaseTool]:
+def get_dangerous_tools() -> tuple[BaseTool, ...]:
     """
     Get dangerous tools (risk_level == "dangerous").
     
     Returns:
-        List of dangerous tool instances
+        Tuple of dangerous tool instances
     """
-    return [t for t in get_all_tools() if get_tool_risk_level(t) == "dangerous"]
+    _ensure_tool_cache()
+    return _DANGEROUS_TOOLS_CACHE or ()
+
+
+def _get_llm_with_tools(role: RoleType) -> tuple[Any, Runnable]:
+    """
+    Get (llm, llm_with_tools) for a role, creating and binding tools only once per role.
+    
+    The cold path does blocking I/O (Ollama probe); async callers go through
+    _aget_llm_with_tools, which runs it in a worker thread.
+    """
+    cached = _LLM_WITH_TOOLS_CACHE.get(role)
+    if cached is not None:
+        return cached
+    tools = _ensure_tool_cache()
+    with _llm_with_tools_lock:
+        # 加锁后再查一次：等锁期间可能已由其他线程构建完成
+        cached = _LLM_WITH_TOOLS_CACHE.get(role)
+        if cached is None:
+            # 先刷新 Ollama 可用性，create() 只读取探测结果、不发起网络请求
+            LLMFactory.refresh_ollama_status(role)
+            llm = LLMFactory.create(role)
+            cached = (llm, llm.bind_tools(tools))
+            _LLM_WITH_TOOLS_CACHE[role] = cached
+    return cached
+
+
+async def _aget_llm_with_tools(role: RoleType) -> tuple[Any, Runnable]:
+    """
+    Async variant for graph nodes: the cold path (model client creation) runs
+    in a worker thread so it never blocks the event loop.
+    """
+    cached = _LLM_WITH_TOOLS_CACHE.get(role)
+    if cached is None:
+        cached = await asyncio.to_thread(_get_llm_with_tools, role)
+    return cached
+
+
+def invalidate_llm_cache(role: Optional[RoleType] = None) -> None:
+    """
+    Drop cached LLM instances (all roles, or just one).
+    
+    Call this after changing role configuration at runtime.
+    """
+    with _llm_with_tools_lock:
+        if role is None:
+            _LLM_WITH_TOOLS_CACHE.clear()
+        else:
+            _LLM_WITH_TOOLS_CACHE.pop(role, None)
+    LLMFactory.clear_cache(role)
 
 
 def check_tool_calls_safety(tool_calls: Sequence[Union[dict, Any]]) -> tuple[bool, List[str]]:
@@ -91,16 +205,13 @@ def check_tool_calls_safety(tool_calls: Sequence[Union[dict, Any]]) -> tuple[boo
         Tuple of (all_safe: bool, dangerous_tool_names: List[str])
     """
     dangerous_tools = []
+    risk_by_name = _RISK_BY_NAME
     
     for call in tool_calls:
         # Support both dict and ToolCall objects
         tool_name = call.get("name", "") if isinstance(call, dict) else getattr(call, "name", "")
-        tool = get_tool_by_name(tool_name)
-        
-        if tool is None:
-            # Unknown tool - treat as dangerous
-            dangerous_tools.append(tool_name)
-        elif get_tool_risk_level(tool) == "dangerous":
+        # Unknown tool - treat as dangerous
+        if risk_by_name.get(tool_name, "dangerous") == "dangerous":
             dangerous_tools.append(tool_name)
     
     return len(dangerous_tools) == 0, dangerous_tools
@@ -108,6 +219,7 @@ def check_tool_calls_safety(tool_calls: Sequence[Union[dict, Any]]) -> tuple[boo
 
 # ============== System Prompt ==============
 
+@lru_cache(maxsize=16)
 def get_system_prompt(mode: str = "text", role: str = "default") -> str:
     """
     Generate dynamic system prompt based on interaction mode and role.
@@ -123,21 +235,12 @@ def get_system_prompt(mode: str = "text", role: str = "default") -> str:
         完整的 system prompt 字符串
     """
     personality = Config.PERSONALITY
-    base = personality.get("base", {})
     voice_cfg = personality.get("voice_mode", {})
     text_cfg = personality.get("text_mode", {})
     role_traits = personality.get("roles", {})
     
-    # 基础人格
-    name = base.get("name", "Jarvis")
-    trait = base.get("trait", "简洁、专业、友好")
-    language = base.get("language", "中文")
-    
-    prompt_parts = [
-        f"你是 {name}，一个智能 AI 助手。",
-        f"你的特点：{trait}",
-        f"使用{language}与用户交流。",
-    ]
+    # 基础人格（与 Config.get_personality_prompt 共用同一份实现）
+    prompt_parts = [Config.get_personality_prompt()]
     
     # 角色特定人格
     if role in role_traits:
@@ -146,7 +249,7 @@ def get_system_prompt(mode: str = "text", role: str = "default") -> str:
     # 交互模式约束（核心差异点）
     if mode == "voice":
         style = voice_cfg.get("style", "极度简洁，1-2句话")
-        rules = voice_cfg.get("rules", [])
+        rules = voice_cfg.get("rules", ())
         prompt_parts.append(f"\n【语音模式 - 极其重要】\n风格要求：{style}")
         if rules:
             prompt_parts.append("必须遵守的规则：")
@@ -161,7 +264,7 @@ def get_system_prompt(mode: str = "text", role: str = "default") -> str:
     else:
         # 文字模式
         style = text_cfg.get("style", "清晰准确，可以适当详细")
-        rules = text_cfg.get("rules", [])
+        rules = text_cfg.get("rules", ())
         prompt_parts.append(f"\n【文字模式】\n风格：{style}")
         if rules:
             for rule in rules:
@@ -180,8 +283,31 @@ def get_system_prompt(mode: str = "text", role: str = "default") -> str:
     return "\n".join(prompt_parts)
 
 
-# Legacy constant for backward compatibility
-DEFAULT_SYSTEM_PROMPT = get_system_prompt()
+# (mode, role) -> 预构建的 SystemMessage，每轮对话只需一次字典查找
+_SYSTEM_MSG_CACHE: dict[tuple[str, str], SystemMessage] = {}
+
+
+def _get_system_message(mode: str, role: str) -> SystemMessage:
+    """Get the cached SystemMessage for a (mode, role) pair."""
+    key = (mode, role)
+    msg = _SYSTEM_MSG_CACHE.get(key)
+    if msg is None:
+        msg = _SYSTEM_MSG_CACHE[key] = SystemMessage(content=get_system_prompt(mode=mode, role=role))
+    return msg
+
+
+def clear_system_prompt_cache() -> None:
+    """Clear cached system prompts (call after changing personality config at runtime)."""
+    get_system_prompt.cache_clear()
+    _SYSTEM_MSG_CACHE.clear()
+
+
+def __getattr__(name: str) -> Any:
+    # Legacy constant for backward compatibility (PEP 562: built on first access)
+    if name == "DEFAULT_SYSTEM_PROMPT":
+        value = globals()["DEFAULT_SYSTEM_PROMPT"] = get_system_prompt()
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # ============== Graph Nodes ==============
@@ -200,30 +326,43 @@ async def state_updater_node(state: AgentState) -> NodeOutput:
     Returns:
         Updated state with new current_role if switch detected
     """
-    messages = state.get("messages", [])
-    current_role = state.get("current_role", "default")
+    messages = state.messages
+    current_role = state.current_role
     
     # Check recent messages for role switch marker
-    # Only look at last few messages to avoid old matches
-    for msg in reversed(messages[-5:]):
-        # Check if this is a ToolMessage from switch_role
-        msg_name = getattr(msg, 'name', '')
-        if msg_name == 'switch_role':
-            content = str(getattr(msg, 'content', ''))
-            if ROLE_SWITCH_MARKER in content:
-                # Extract new role from marker
-                for line in content.split('\n'):
-                    if line.startswith(ROLE_SWITCH_MARKER):
-                        new_role = line.split(':')[1].strip()
-                        if new_role and new_role != current_role:
-                            logger.info(f"Role switch detected: {current_role} -> {new_role}")
-                            return {"current_role": new_role}
-                break
+    # Only look at last few messages to avoid old matches (index walk, no slice copy)
+    for i in range(len(messages) - 1, max(-1, len(messages) - 6), -1):
+        msg = messages[i]
+        # Check if this is a ToolMessage from switch_role (direct attribute access)
+        if not isinstance(msg, ToolMessage) or msg.name != 'switch_role':
+            continue
+        content = msg.content if isinstance(msg.content, str) else str(msg.content)
+        # 定位行首的标记，只切出该行，避免把整个工具输出拆成行列表
+        idx = content.find(ROLE_SWITCH_MARKER)
+        if idx == -1:
+            # 不含标记的 switch_role 结果（如切换失败）不终止查找，继续看更早的消息
+            continue
+        while idx > 0 and content[idx - 1] != '\n':
+            idx = content.find(ROLE_SWITCH_MARKER, idx + 1)
+        if idx != -1:
+            end = content.find('\n', idx)
+            line = content[idx:end] if end != -1 else content[idx:]
+            _, sep, tail = line.partition(':')
+            new_role = tail.split(':', 1)[0].strip() if sep else ''
+            if new_role and new_role != current_role:
+                logger.info("Role switch detected: %s -> %s", current_role, new_role)
+                return {"current_role": new_role}
+        break
     
     # No role switch detected
     return {}
 
 
+def _tool_call_ids(tool_calls: Sequence[Any]) -> set:
+    """Collect tool call ids (tool_calls are normalized to dicts when they enter state)."""
+    return {tc.get("id") for tc in tool_calls}
+
+
 def _sanitize_messages_for_gemini(messages: List[BaseMessage]) -> List[BaseMessage]:
     """
     清理消息历史以符合 Gemini API 的严格要求。
@@ -246,50 +385,49 @@ def _sanitize_messages_for_gemini(messages: List[BaseMessage]) -> List[BaseMessa
     if not messages:
         return messages
     
-    sanitized = []
+    # 常见情况：历史中没有任何 tool_calls，只需处理末尾的 ToolMessage
+    if not any(isinstance(m, AIMessage) and m.tool_calls for m in messages):
+        end = len(messages)
+        while end and isinstance(messages[end - 1], ToolMessage):
+            end -= 1
+        if end < len(messages):
+            logger.debug("Removing trailing ToolMessage for Gemini compatibility")
+            return list(messages[:end])
+        return messages
+    
+    sanitized: List[BaseMessage] = []
+    n = len(messages)
     i = 0
     
-    while i < len(messages):
+    while i < n:
         msg = messages[i]
         
         # 检查是否是带有 tool_calls 的 AIMessage
-        if isinstance(msg, AIMessage) and getattr(msg, 'tool_calls', None):
-            tool_calls = msg.tool_calls
-            tool_call_ids = {tc.get('id') or tc.id for tc in tool_calls if hasattr(tc, 'id') or isinstance(tc, dict)}
+        if isinstance(msg, AIMessage) and msg.tool_calls:
+            tool_call_ids = _tool_call_ids(msg.tool_calls)
             
-            # 查找后续的 ToolMessage，确保所有 tool_calls 都有对应的响应
+            # 向后扫描紧随其后的 ToolMessage，确保所有 tool_calls 都有对应的响应
             j = i + 1
-            found_tool_messages = []
             found_ids = set()
-            
-            while j < len(messages):
+            while j < n:
                 next_msg = messages[j]
-                if isinstance(next_msg, ToolMessage):
-                    tool_call_id = getattr(next_msg, 'tool_call_id', None)
-                    if tool_call_id in tool_call_ids:
-                        found_tool_messages.append(next_msg)
-                        found_ids.add(tool_call_id)
-                        j += 1
-                        continue
                 # 遇到非 ToolMessage 或不匹配的 ToolMessage，停止搜索
-                break
+                if not isinstance(next_msg, ToolMessage) or next_msg.tool_call_id not in tool_call_ids:
+                    break
+                found_ids.add(next_msg.tool_call_id)
+                j += 1
             
-            # 检查是否所有 tool_calls 都有对应的 ToolMessage
-            if found_ids == tool_call_ids and len(found_ids) > 0:
-                # 完整的 tool call 序列，保留
-                sanitized.append(msg)
-                sanitized.extend(found_tool_messages)
+            if found_ids and found_ids == tool_call_ids:
+                # 完整的 tool call 序列，整段保留
+                sanitized.extend(messages[i:j])
                 i = j
             else:
-                # 不完整的 tool call 序列
-                # 创建一个没有 tool_calls 的新 AIMessage，只保留 content
+                # 不完整的 tool call 序列：保留文本内容，移除 tool_calls
                 if msg.content:
-                    # 保留文本内容，移除 tool_calls
-                    clean_msg = AIMessage(content=msg.content)
-                    sanitized.append(clean_msg)
-                    logger.debug(f"Sanitized incomplete tool_calls from AIMessage")
+                    sanitized.append(AIMessage(content=msg.content))
+                    logger.debug("Sanitized incomplete tool_calls from AIMessage")
                 # 跳过孤立的 ToolMessage
-                i = j if j > i + 1 else i + 1
+                i = j
         else:
             # 普通消息，直接保留
             sanitized.append(msg)
@@ -322,47 +460,53 @@ async def chatbot_node(state: AgentState) -> NodeOutput:
     Returns:
         A dict with the new message(s) to append to state
     """
-    messages = state.get("messages", [])
-    role_str = state.get("current_role") or "default"
-    mode = state.get("interaction_mode") or "text"  # 默认文字模式
+    messages = state.messages
+    # current_role / interaction_mode 已在 AgentState 构建时归一化
+    role_str = cast(str, state.current_role)
+    mode = cast(str, state.interaction_mode)
     role = cast(RoleType, role_str)
     
-    # Get the LLM for the current role
-    llm = LLMFactory.create(role)
-    
-    # Bind tools to LLM
-    tools = get_all_tools()
-    llm_with_tools = llm.bind_tools(tools)
-    
-    # Generate dynamic system prompt based on mode and role
-    system_prompt = get_system_prompt(mode=mode, role=role_str)
+    # Get the LLM for the current role (tools bound once per role and cached)
+    llm, llm_with_tools = await _aget_llm_with_tools(role)
     
-    # Filter out old system messages to avoid confusion
-    filtered_messages = [m for m in messages if not isinstance(m, SystemMessage)]
+    # Dynamic system prompt based on mode and role (cached per pair)
+    system_message = _get_system_message(mode, role_str)
     
     # 🔧 消息截断：避免 context 超出限制
-    # 保留最近的 N 条消息（可通过 Config 配置）
+    # 从尾部向前收集最近的 N 条非 System 消息（可通过 Config 配置），
+    # 扫描量只与 N 相关，与持久化历史的总长度无关；旧的 system 消息一并过滤
     MAX_HISTORY_MESSAGES = getattr(Config, 'MAX_HISTORY_MESSAGES', 30)
-    if len(filtered_messages) > MAX_HISTORY_MESSAGES:
-        # 保留最近的消息，确保最后一条是用户消息
-        filtered_messages = filtered_messages[-MAX_HISTORY_MESSAGES:]
-        logger.info(f"Truncated message history to {MAX_HISTORY_MESSAGES} messages")
+    keep: deque[BaseMessage] = deque(maxlen=MAX_HISTORY_MESSAGES)
+    truncated = False
+    for idx in range(len(messages) - 1, -1, -1):
+        m = messages[idx]
+        if isinstance(m, SystemMessage):
+            continue
+        if len(keep) == MAX_HISTORY_MESSAGES:
+            truncated = True
+            break
+        keep.appendleft(m)
+    # 非 Gemini 路径直接从 deque 拼装，整轮只分配一次消息列表
+    filtered_messages: Sequence[BaseMessage] = keep
+    if truncated:
+        logger.info("Truncated message history to %d messages", MAX_HISTORY_MESSAGES)
     
     # 🔧 Gemini 兼容性处理：清理不完整的 tool_calls 序列
     # Gemini API 要求：function call 后必须紧跟 function response
     # 如果历史消息中有孤立的 tool_calls（没有对应的 ToolMessage），会导致错误
     if role_str in ("vision", "smart") or "gemini" in str(getattr(llm, 'model', '')).lower():
-        filtered_messages = _sanitize_messages_for_gemini(filtered_messages)
+        # 无需修改时 sanitizer 原样返回输入列表
+        filtered_messages = _sanitize_messages_for_gemini(list(keep))
     
-    messages_to_send = [SystemMessage(content=system_prompt)] + filtered_messages
+    messages_to_send = [system_message, *filtered_messages]
     
-    logger.debug(f"Invoking LLM with {len(messages_to_send)} messages, mode={mode}, role={role_str}")
+    logger.debug("Invoking LLM with %d messages, mode=%s, role=%s", len(messages_to_send), mode, role_str)
     
     # Invoke the LLM asynchronously with error handling
     try:
         response: AIMessage = await llm_with_tools.ainvoke(messages_to_send)
     except Exception as e:
-        logger.error(f"LLM invocation failed: {e}")
+        logger.error("LLM invocation failed: %s", e)
         # 返回错误消息而不是崩溃
         error_msg = f"抱歉，AI 模型调用失败：{str(e)[:100]}"
         return {"messages": [AIMessage(content=error_msg)]}
@@ -372,12 +516,23 @@ async def chatbot_node(state: AgentState) -> NodeOutput:
         logger.warning("LLM returned empty response")
         return {"messages": [AIMessage(content="抱歉，我没有收到有效的响应。请重试或检查网络连接。")]}
     
-    logger.debug(f"LLM response: {str(response.content)[:100]}...")
+    logger.debug("LLM response: %.100s...", response.content)
     
     # Return the response to be added to messages via the reducer
     return {"messages": [response]}
 
 
+def _route_after_chatbot(state: AgentState) -> str:
+    """
+    Route chatbot output: "tools" if the last message requests tool calls, else END.
+    
+    Specialized replacement for langgraph.prebuilt.tools_condition for our fixed schema.
+    """
+    messages = state.messages
+    last = messages[-1] if messages else None
+    return "tools" if isinstance(last, AIMessage) and last.tool_calls else END
+
+
 def create_graph(
     role: RoleType = "default",
     system_prompt: Optional[str] = None,
@@ -395,7 +550,7 @@ def create_graph(
     - Optional interrupt before tools for safety
     
     Graph flow:
-        START -> chatbot -> tools_condition -> tools -> chatbot
+        START -> chatbot -> _route_after_chatbot -> tools -> chatbot
                                            -> END
     
     Args:
@@ -433,10 +588,11 @@ def create_graph(
     workflow.add_edge(START, "chatbot")
     
     # chatbot -> tools (if tool_calls) or END
-    # tools_condition routes to "tools" if there are tool calls, otherwise to END
+    # _route_after_chatbot routes to "tools" if there are tool calls, otherwise to END
     workflow.add_conditional_edges(
         "chatbot",
-        tools_condition,
+        _route_after_chatbot,
+        {"tools": "tools", END: END},
     )
     
     # tools -> state_updater -> chatbot (loop back after tool execution)
@@ -456,16 +612,61 @@ def create_graph(
     # Compile the graph
     compiled = workflow.compile(**compile_kwargs)
     
-    logger.info(f"Graph compiled with {len(tools)} tools, "
-                f"checkpointer={'enabled' if checkpointer else 'disabled'}, "
-                f"interrupt={'enabled' if interrupt_before_tools else 'disabled'}")
+    logger.info("Graph compiled with %d tools, checkpointer=%s, interrupt=%s",
+                len(tools),
+                "enabled" if checkpointer else "disabled",
+                "enabled" if interrupt_before_tools else "disabled")
     
     return compiled
 
 
+def prewarm(role: RoleType = "default") -> Optional[threading.Thread]:
+    """
+    Warm the per-role LLM/tool binding and system prompts in a daemon thread.
+    
+    Moves cold-start cost (model client creation, bind_tools) off the first
+    user turn. Disabled with JARVIS_PREWARM=false.
+    
+    Returns:
+        The started thread, or None if prewarming is disabled
+    """
+    if not Config.PREWARM_ENABLED:
+        return None
+    
+    def _run() -> None:
+        try:
+            _get_llm_with_tools(role)
+            for mode in ("voice", "text"):
+                _get_system_message(mode, role)
+        except Exception:
+            logger.exception("Graph prewarm failed for role=%s", role)
+    
+    thread = threading.Thread(target=_run, daemon=True, name="graph-prewarm")
+    thread.start()
+    return thread
+
+
+async def aprewarm_connections(role: RoleType = "default") -> None:
+    """
+    Open the role's LLM keep-alive connection on the running event loop.
+    
+    The graph calls the model with ainvoke, whose pooled connections belong to
+    the event loop, so this runs as a task on the main loop rather than in the
+    prewarm thread. Disabled with JARVIS_PREWARM=false.
+    """
+    if not Config.PREWARM_ENABLED:
+        return
+    try:
+        llm, _ = await _aget_llm_with_tools(role)
+        await awarm_connection(llm)
+    except Exception:
+        logger.debug("Connection prewarm failed for role=%s", role, exc_info=True)
+
+
 # Pre-compiled default graph instance for convenience
 # This is lazily evaluated when first accessed
 _default_graph: Optional[CompiledStateGraph] = None
+_graph_lock = threading.Lock()
 
 
 def get_graph() -> CompiledStateGraph:
@@ -477,7 +678,10 @@ def get_graph() -> CompiledStateGraph:
     """
     global _default_graph
     if _default_graph is None:
-        _default_graph = create_graph()
+        # Double-checked locking: concurrent first callers compile only once
+        with _graph_lock:
+            if _default_graph is None:
+                _default_graph = create_graph()
     return _default_graph
 
 
@@ -498,5 +702,7 @@ def init_graph() -> CompiledStateGraph:
     """
     global graph
     if graph is None:
-        graph = create_graph()
+        with _graph_lock:
+            if graph is None:
+                graph = create_graph()
     return graph
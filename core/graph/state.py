@@ -7,18 +7,46 @@ agent system. The state is immutable and passed between nodes in the graph.
 
 from __future__ import annotations
 
+from dataclasses import dataclass, field
 from typing import Annotated, Optional, Any, Literal
-from typing_extensions import TypedDict
 
 from langgraph.graph.message import add_messages
-from langchain_core.messages import BaseMessage
+from langchain_core.messages import AIMessage, BaseMessage
 
 
 # 交互模式类型
 InteractionMode = Literal["voice", "text"]
 
 
-class AgentState(TypedDict):
+def _tool_call_as_dict(tc: Any) -> dict[str, Any]:
+    """Convert a ToolCall-like object to the plain dict form."""
+    if isinstance(tc, dict):
+        return tc
+    return {
+        "name": getattr(tc, "name", ""),
+        "args": getattr(tc, "args", {}),
+        "id": getattr(tc, "id", None),
+        "type": "tool_call",
+    }
+
+
+def add_messages_normalized(current: Any, new: Any) -> Any:
+    """
+    add_messages reducer that normalizes AIMessage.tool_calls to plain dicts
+    once, when the message enters state.
+    
+    Downstream consumers (e.g. the Gemini sanitizer) can then rely on
+    flat dict access instead of per-turn type dispatch.
+    """
+    for m in (new if isinstance(new, list) else (new,)):
+        if isinstance(m, AIMessage) and m.tool_calls:
+            if not all(isinstance(tc, dict) for tc in m.tool_calls):
+                m.tool_calls = [_tool_call_as_dict(tc) for tc in m.tool_calls]
+    return add_messages(current, new)
+
+
+@dataclass(slots=True)
+class AgentState:
     """
     Core state for the Jarvis agent graph.
     
@@ -26,38 +54,51 @@ class AgentState(TypedDict):
     the current context of the conversation and agent execution.
     
     Attributes:
-        messages: The conversation history. Uses `add_messages` reducer
-                  which automatically handles message appending and deduplication.
+        messages: The conversation history. Uses the `add_messages_normalized`
+                  reducer (add_messages + tool_call normalization), which
+                  handles message appending and deduplication.
         current_role: The active LLM role being used (default, smart, coder, fast, vision)
         interaction_mode: Current interaction mode ("voice" or "text")
         metadata: Optional metadata for the current turn (tool results, context, etc.)
     
-    The `add_messages` annotation is a LangGraph reducer that:
+    The underlying `add_messages` LangGraph reducer:
     - Appends new messages to the existing list
     - Handles message ID deduplication
     - Supports both single messages and lists of messages
     
+    Nodes receive an AgentState instance (slotted attribute access) and
+    return partial dict updates (NodeOutput). Graph input may still be a
+    plain dict with the same keys. Missing or empty current_role /
+    interaction_mode are normalized to "default" / "text" on construction.
+    
     Example:
-        state = {
+        graph.ainvoke({
             "messages": [HumanMessage(content="Hello")],
             "current_role": "default",
             "interaction_mode": "voice",
             "metadata": {}
-        }
+        })
     """
     
-    # Core message history with LangGraph's add_messages reducer
+    # Core message history with LangGraph's add_messages reducer (tool_calls normalized on ingest)
     # This automatically handles appending and deduplication
-    messages: Annotated[list[BaseMessage], add_messages]
+    messages: Annotated[list[BaseMessage], add_messages_normalized] = field(default_factory=list)
     
     # Current LLM role being used (for multi-model support)
-    current_role: Optional[str]
+    current_role: Optional[str] = "default"
     
     # 交互模式：voice(语音) 或 text(文字)，影响 system prompt 生成
-    interaction_mode: Optional[InteractionMode]
+    interaction_mode: Optional[InteractionMode] = "text"
     
     # Flexible metadata storage for tool results, intermediate data, etc.
-    metadata: Optional[dict[str, Any]]
+    metadata: Optional[dict[str, Any]] = None
+    
+    def __post_init__(self):
+        # 构建时一次性归一化，节点内可直接读取而无需再做 `or` 兜底
+        if not self.current_role:
+            self.current_role = "default"
+        if not self.interaction_mode:
+            self.interaction_mode = "text"
 
 
 # Type alias for return values from nodes
@@ -12,16 +12,30 @@ Supported Providers:
 
 from __future__ import annotations
 
+import json
 import logging
-from typing import Literal, Optional
+import threading
+import time
+from dataclasses import replace
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Literal, Optional
 
+import httpx
 from langchain_core.language_models.chat_models import BaseChatModel
 from langchain_openai import ChatOpenAI
-from langchain_ollama import ChatOllama
-from langchain_google_genai import ChatGoogleGenerativeAI
 from pydantic import BaseModel, Field
 
-from config import Config
+if TYPE_CHECKING:
+    from langchain_ollama import ChatOllama
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+try:  # 可选依赖：orjson 解析速度是标准库 json 的数倍
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+from config import Config, RoleConfig
 
 logger = logging.getLogger(__name__)
 
@@ -31,6 +45,117 @@ RoleType = Literal["default", "smart", "coder", "fast", "vision"]
 # Type alias for supported providers
 ProviderType = Literal["openai", "ollama", "gemini"]
 
+# HTTP 连接池参数：保持长连接，避免 agent 循环中每次请求重新握手 TCP/TLS
+_HTTP_LIMITS = httpx.Limits(
+    max_keepalive_connections=20,
+    max_connections=50,
+    keepalive_expiry=30,
+)
+
+# 按需导入的 provider 类：langchain_ollama / langchain_google_genai 各自导入耗时
+# 接近一秒，未使用的 provider 不应拖慢启动；导入一次后缓存类引用
+_lazy_classes: dict[str, type] = {}
+
+
+def _chat_ollama_cls() -> type[ChatOllama]:
+    cls = _lazy_classes.get("ollama")
+    if cls is None:
+        from langchain_ollama import ChatOllama
+        cls = _lazy_classes["ollama"] = ChatOllama
+    return cls
+
+
+def _chat_gemini_cls() -> type[ChatGoogleGenerativeAI]:
+    cls = _lazy_classes.get("gemini")
+    if cls is None:
+        from langchain_google_genai import ChatGoogleGenerativeAI
+        cls = _lazy_classes["gemini"] = ChatGoogleGenerativeAI
+    return cls
+
+
+# 共享连接池：指向同一 (base_url, api_key) 的角色复用同一对 httpx 客户端，
+# 例如 smart/coder/fast 都走 DeepSeek 时只维持一份 TLS 长连接
+_SHARED_CLIENTS: dict[tuple[Optional[str], Optional[str]], tuple[httpx.Client, httpx.AsyncClient]] = {}
+_shared_clients_lock = threading.Lock()
+
+
+def _shared_http_clients(base_url: Optional[str], api_key: Optional[str]) -> tuple[httpx.Client, httpx.AsyncClient]:
+    """Get (or create) the pooled sync/async clients for an endpoint + credential pair."""
+    key = (base_url, api_key)
+    with _shared_clients_lock:
+        clients = _SHARED_CLIENTS.get(key)
+        if clients is None or clients[0].is_closed or clients[1].is_closed:
+            # 超时由 ChatOpenAI 按请求传入，这里只负责连接池
+            clients = _SHARED_CLIENTS[key] = (
+                httpx.Client(limits=_HTTP_LIMITS),
+                httpx.AsyncClient(limits=_HTTP_LIMITS),
+            )
+        return clients
+
+
+def _pop_shared_clients() -> list[tuple[httpx.Client, httpx.AsyncClient]]:
+    """Detach all shared clients so the caller can close them."""
+    with _shared_clients_lock:
+        clients = list(_SHARED_CLIENTS.values())
+        _SHARED_CLIENTS.clear()
+    return clients
+
+# Ollama 可用性探测结果缓存：host -> (过期时间, 模型名集合 或 None 表示不可用)
+_OLLAMA_PROBE_TTL = 30.0  # 秒
+_ollama_probe_cache: dict[str, tuple[float, Optional[frozenset[str]]]] = {}
+_ollama_probe_lock = threading.Lock()
+
+
+def _probe_ollama(host: str) -> tuple[Optional[frozenset[str]], bool]:
+    """
+    Probe an Ollama host (blocking; keep it off the event loop).
+    
+    Returns (model names or None if unreachable, whether the network was hit).
+    A cheap HEAD is tried first; the model list is fetched and parsed only when the
+    server answers. Results are cached for _OLLAMA_PROBE_TTL seconds.
+    """
+    now = time.monotonic()
+    with _ollama_probe_lock:
+        cached = _ollama_probe_cache.get(host)
+        if cached is not None and cached[0] > now:
+            return cached[1], False
+    
+    names: Optional[frozenset[str]] = None
+    url = f"{host.rstrip('/')}/api/tags"
+    try:
+        with httpx.Client(timeout=2.0) as client:
+            if client.head(url).status_code == 200:
+                response = client.get(url)
+                response.raise_for_status()
+                names = frozenset(m.get("name", "") for m in _loads(response.content).get("models", []))
+    except (httpx.HTTPError, ValueError) as e:
+        logger.debug("Ollama probe failed for %s: %s", host, e)
+    
+    if names is None:
+        # 只在探测结果刷新时告警，缓存命中不重复刷日志
+        logger.warning("Ollama host %s unreachable, falling back to OpenAI", host)
+    
+    with _ollama_probe_lock:
+        _ollama_probe_cache[host] = (now + _OLLAMA_PROBE_TTL, names)
+    return names, True
+
+
+def _last_ollama_probe(host: str) -> tuple[bool, Optional[frozenset[str]]]:
+    """Non-blocking read of the last probe result: (probed yet, model names or None)."""
+    with _ollama_probe_lock:
+        cached = _ollama_probe_cache.get(host)
+    if cached is None:
+        return False, None
+    return True, cached[1]
+
+
+def _ollama_has_model(names: frozenset[str], model: str) -> bool:
+    """Match 'qwen2.5' against 'qwen2.5:latest' style tags without a substring scan."""
+    if model in names:
+        return True
+    prefix = model + ":"
+    return any(n.startswith(prefix) for n in names)
+
 
 class LLMConfig(BaseModel):
     """Validated LLM configuration."""
@@ -60,8 +185,13 @@ class LLMFactory:
     
     _DEFAULT_ROLE: RoleType = "default"
     
+    # 已创建的模型实例：(role, provider, temperature, kwargs) -> BaseChatModel
+    # 避免每次调用都重新做 Pydantic 校验并新建 httpx 客户端
+    _instances: dict[tuple, BaseChatModel] = {}
+    _instances_lock = threading.Lock()
+    
     @classmethod
-    def _get_role_config(cls, role: RoleType) -> dict:
+    def _get_role_config(cls, role: RoleType) -> RoleConfig:
         """
         Get configuration for a specific role from Config.LLM_ROLES.
         Falls back to 'default' if role not found.
@@ -69,99 +199,170 @@ class LLMFactory:
         roles = getattr(Config, 'LLM_ROLES', {})
         
         if role not in roles:
-            logger.warning(f"Role '{role}' not found in LLM_ROLES, falling back to 'default'")
+            logger.warning("Role '%s' not found in LLM_ROLES, falling back to 'default'", role)
             role = cls._DEFAULT_ROLE
         
-        config = roles.get(role, {})
+        config = roles.get(role)
         
-        # If the role config is empty or missing critical fields, fallback to default
-        if not config or not config.get('provider'):
-            logger.warning(f"Role '{role}' has invalid config, falling back to 'default'")
-            config = roles.get(cls._DEFAULT_ROLE, {})
+        # If the role config is missing or has no provider, fallback to default
+        if config is None or not config.provider:
+            logger.warning("Role '%s' has invalid config, falling back to 'default'", role)
+            config = roles[cls._DEFAULT_ROLE]
         
         return config
     
-    @classmethod
-    def _resolve_provider(cls, config: dict) -> ProviderType:
+    @staticmethod
+    def _static_provider(config: RoleConfig) -> ProviderType:
         """
-        Resolve the provider type from config.
+        Resolve the provider from static configuration.
         Implements configuration-level fallback:
         - If provider is 'ollama' but no host configured, fallback to 'openai'
         - If provider is 'gemini' but no api_key configured, fallback to 'openai'
         """
-        provider = config.get('provider', 'openai')
+        provider = config.provider
         
         if provider == 'ollama':
             # Check if Ollama is properly configured
-            host = config.get('host')
-            if not host:
+            if not config.host:
                 logger.warning("Ollama provider selected but no host configured, falling back to OpenAI")
                 return 'openai'
             return 'ollama'
         
         elif provider == 'gemini':
             # Check if Gemini API key is available
-            api_key = config.get('api_key')
-            if not api_key:
+            if not config.api_key:
                 logger.warning("Gemini provider selected but no API key configured, falling back to OpenAI")
                 return 'openai'
             return 'gemini'
         
         return 'openai'
     
+    @classmethod
+    @lru_cache(maxsize=8)
+    def _resolved(cls, role: RoleType) -> tuple[RoleConfig, ProviderType]:
+        """
+        Role lookup + static provider fallback, run once per role.
+        
+        Config.LLM_ROLES is static, so the warnings and fallbacks above only
+        need to happen the first time a role is requested.
+        """
+        config = cls._get_role_config(role)
+        provider = cls._static_provider(config)
+        if provider != config.provider:
+            return cls._fallback_config(config), provider
+        return config, provider
+    
+    @staticmethod
+    @lru_cache(maxsize=8)
+    def _fallback_config(config: RoleConfig) -> RoleConfig:
+        """
+        The role's config for its OpenAI fallback.
+        
+        Keeps the role's own api_key / base_url (the *_LLM_API_KEY / *_LLM_BASE_URL
+        "OpenAI fallback" settings) and only swaps the Ollama/Gemini model name for
+        the role's fallback_model.
+        """
+        return replace(config, provider="openai", model=config.fallback_model or config.model)
+    
+    @staticmethod
+    def _ollama_usable(config: RoleConfig) -> bool:
+        """
+        Non-blocking check against the last Ollama probe result.
+        
+        Until a probe has run (see refresh_ollama_status), the configured Ollama
+        provider is trusted, as before availability probing existed.
+        """
+        probed, names = _last_ollama_probe(config.host)
+        if not probed:
+            return True
+        return names is not None and _ollama_has_model(names, config.model)
+    
+    @classmethod
+    def refresh_ollama_status(cls, role: RoleType) -> bool:
+        """
+        Probe the role's Ollama host and model (blocking HTTP, cached for 30s).
+        
+        Run from a worker thread (prewarm / asyncio.to_thread); create() and
+        get_role_info() only read the result.
+        """
+        config, provider = cls._resolved(role)
+        if provider != 'ollama':
+            return True
+        names, refreshed = _probe_ollama(config.host)
+        if names is None:
+            return False
+        if not _ollama_has_model(names, config.model):
+            if refreshed:
+                logger.warning("Ollama model '%s' not pulled on %s, falling back to OpenAI", config.model, config.host)
+            return False
+        return True
+    
+    @classmethod
+    def _resolve(cls, role: RoleType) -> tuple[RoleConfig, ProviderType]:
+        """Resolve (config, provider) for a role, including the Ollama availability fallback."""
+        config, provider = cls._resolved(role)
+        if provider == 'ollama' and not cls._ollama_usable(config):
+            return cls._fallback_config(config), 'openai'
+        return config, provider
+    
     @classmethod
     def _create_openai(
         cls,
-        config: dict,
+        config: RoleConfig,
         temperature: float,
         **kwargs
     ) -> ChatOpenAI:
-        """Create a ChatOpenAI instance."""
+        """Create a ChatOpenAI instance (on the shared keep-alive HTTP clients of its endpoint)."""
+        if "http_client" not in kwargs or "http_async_client" not in kwargs:
+            client, async_client = _shared_http_clients(config.base_url, config.api_key)
+            kwargs.setdefault("http_client", client)
+            kwargs.setdefault("http_async_client", async_client)
         return ChatOpenAI(
-            model=config.get('model', 'gpt-3.5-turbo'),
-            api_key=config.get('api_key'),
-            base_url=config.get('base_url'),
+            model=config.model,
+            api_key=config.api_key,
+            base_url=config.base_url,
             temperature=temperature,
-            timeout=config.get('timeout', 60),
+            timeout=config.timeout,
             **kwargs
         )
     
     @classmethod
     def _create_ollama(
         cls,
-        config: dict,
+        config: RoleConfig,
         temperature: float,
         **kwargs
     ) -> ChatOllama:
         """Create a ChatOllama instance."""
-        # Note: ChatOllama uses num_predict for timeout-like behavior
-        # timeout is not a direct parameter, we use request_timeout via kwargs if needed
         ollama_kwargs = {
-            "model": config.get('model', 'llama3:8b'),
-            "base_url": config.get('host', 'http://localhost:11434'),
+            "model": config.model,
+            "base_url": config.host,
             "temperature": temperature,
+            "num_ctx": 4096,  # Reasonable context for longer operations
+            # 底层 ollama 客户端基于 httpx：复用长连接、使用角色的请求超时，并显式启用压缩传输
+            "client_kwargs": {
+                "limits": _HTTP_LIMITS,
+                "timeout": config.timeout,
+                "headers": {"Accept-Encoding": "gzip, deflate"},
+            },
             **kwargs
         }
         
-        # Set request timeout if specified in config
-        if config.get('timeout'):
-            ollama_kwargs["num_ctx"] = 4096  # Reasonable context for longer operations
-        
-        return ChatOllama(**ollama_kwargs)
+        return _chat_ollama_cls()(**ollama_kwargs)
     
     @classmethod
     def _create_gemini(
         cls,
-        config: dict,
+        config: RoleConfig,
         temperature: float,
         **kwargs
     ) -> ChatGoogleGenerativeAI:
         """Create a ChatGoogleGenerativeAI instance."""
-        return ChatGoogleGenerativeAI(
-            model=config.get('model', 'gemini-1.5-flash'),
-            google_api_key=config.get('api_key'),
+        return _chat_gemini_cls()(
+            model=config.model,
+            google_api_key=config.api_key,
             temperature=temperature,
-            timeout=config.get('timeout', 60),
+            timeout=config.timeout,
             **kwargs
         )
     
@@ -175,6 +376,9 @@ class LLMFactory:
         """
         Create a LangChain Chat Model instance for the specified role.
         
+        Instances are memoized per (role, resolved provider, temperature, kwargs);
+        calls with unhashable kwargs always build a fresh instance.
+        
         Args:
             role: The LLM role preset ('default', 'smart', 'coder', 'fast', 'vision')
             temperature: Override the default temperature (0.0-2.0)
@@ -190,22 +394,87 @@ class LLMFactory:
             >>> model = LLMFactory.create("smart")
             >>> response = await model.ainvoke([HumanMessage(content="Hello")])
         """
-        config = cls._get_role_config(role)
-        provider = cls._resolve_provider(config)
+        config, provider = cls._resolve(role)
         
         # Use provided temperature or default to 0.7
         temp = temperature if temperature is not None else 0.7
         
-        logger.info(f"Creating LLM: role={role}, provider={provider}, model={config.get('model')}")
+        # provider 参与缓存键：Ollama 下线回退到 OpenAI 时会得到新的实例
+        try:
+            key: Optional[tuple] = (role, provider, temp, frozenset(kwargs.items()))
+        except TypeError:
+            key = None
         
-        if provider == 'openai':
-            return cls._create_openai(config, temp, **kwargs)
-        elif provider == 'ollama':
-            return cls._create_ollama(config, temp, **kwargs)
-        elif provider == 'gemini':
-            return cls._create_gemini(config, temp, **kwargs)
-        else:
+        if key is not None:
+            with cls._instances_lock:
+                cached = cls._instances.get(key)
+            if cached is not None:
+                return cached
+        
+        logger.info("Creating LLM: role=%s, provider=%s, model=%s", role, provider, config.model)
+        
+        ctor = _CTORS.get(provider)
+        if ctor is None:
             raise ValueError(f"Unsupported provider: {provider}")
+        llm = ctor(config, temp, **kwargs)
+        
+        if key is not None:
+            with cls._instances_lock:
+                llm = cls._instances.setdefault(key, llm)
+        return llm
+    
+    @classmethod
+    def _detach_clients(cls) -> list[tuple[Any, Any]]:
+        """Drop all memoized models and return every (sync, async) client pair they used."""
+        with cls._instances_lock:
+            instances = list(cls._instances.values())
+            cls._instances.clear()
+        pairs = {}
+        for llm in instances:
+            _, client, async_client = _http_clients(llm)
+            pairs[(id(client), id(async_client))] = (client, async_client)
+        for client, async_client in _pop_shared_clients():
+            pairs[(id(client), id(async_client))] = (client, async_client)
+        return list(pairs.values())
+    
+    @classmethod
+    def close(cls) -> None:
+        """
+        Close the sync HTTP clients of all memoized models and drop them.
+        
+        Async clients must be closed on their event loop; use aclose() there.
+        """
+        for client, _ in cls._detach_clients():
+            if client is not None:
+                client.close()
+    
+    @classmethod
+    async def aclose(cls) -> None:
+        """Close both sync and async HTTP clients of all memoized models and drop them."""
+        for client, async_client in cls._detach_clients():
+            if client is not None:
+                client.close()
+            if async_client is not None:
+                try:
+                    await async_client.aclose()
+                except Exception as e:
+                    logger.debug("Async client close failed: %s", e)
+    
+    @classmethod
+    def clear_cache(cls, role: Optional[RoleType] = None) -> None:
+        """
+        Drop memoized model instances (all roles, or just one).
+        
+        Clients are left open: OpenAI-compatible roles share pooled clients
+        with other roles, and dropped instances may still be in use elsewhere.
+        """
+        with cls._instances_lock:
+            if role is None:
+                cls._instances.clear()
+                cls._resolved.cache_clear()
+            else:
+                for key in [k for k in cls._instances if k[0] == role]:
+                    del cls._instances[key]
     
     @classmethod
     def get_available_roles(cls) -> list[RoleType]:
@@ -216,16 +485,23 @@ class LLMFactory:
     @classmethod
     def get_role_info(cls, role: RoleType) -> dict:
         """Get provider and model info for a role (for debugging)."""
-        config = cls._get_role_config(role)
-        provider = cls._resolve_provider(config)
+        config, provider = cls._resolve(role)
         return {
             "role": role,
             "provider": provider,
-            "model": config.get('model'),
-            "base_url": config.get('base_url') or config.get('host'),
+            "model": config.model,
+            "base_url": config.base_url or config.host,
         }
 
 
+# provider -> 构造函数（字典分派，代替 if/elif 链）
+_CTORS: dict[str, Callable[..., BaseChatModel]] = {
+    "openai": LLMFactory._create_openai,
+    "ollama": LLMFactory._create_ollama,
+    "gemini": LLMFactory._create_gemini,
+}
+
+
 # Convenience function for quick access
 def get_llm(role: RoleType = "default", **kwargs) -> BaseChatModel:
     """
@@ -241,6 +517,37 @@ def get_llm(role: RoleType = "default", **kwargs) -> BaseChatModel:
     return LLMFactory.create(role, **kwargs)
 
 
+def _http_clients(llm: BaseChatModel) -> tuple[Optional[str], Any, Any]:
+    """Return (endpoint url, sync httpx client, async httpx client) of a chat model, if known."""
+    if isinstance(llm, ChatOpenAI):
+        return llm.openai_api_base, llm.http_client, llm.http_async_client
+    # 从未导入过 ChatOllama 时，llm 不可能是它的实例
+    ollama_cls = _lazy_classes.get("ollama")
+    if ollama_cls is not None and isinstance(llm, ollama_cls):
+        sync_client = getattr(llm._client, "_client", None)
+        async_client = getattr(llm._async_client, "_client", None)
+        return llm.base_url, sync_client, async_client
+    # Gemini 走 google SDK 自己的传输层
+    return None, None, None
+
+
+async def awarm_connection(llm: BaseChatModel) -> None:
+    """
+    Open the keep-alive connection of a model's async HTTP client with a HEAD request.
+    
+    Moves the TCP/TLS handshake off the first real request; failures are ignored.
+    Must run on the event loop that will later use the model: pooled async
+    connections are bound to the loop that opened them.
+    """
+    url, _, client = _http_clients(llm)
+    if not url or client is None:
+        return
+    try:
+        await client.head(url)
+    except Exception as e:
+        logger.debug("Connection warmup failed for %s: %s", url, e)
+
+
 def get_model_name(llm: BaseChatModel) -> str:
     """
     统一获取 LangChain LLM 实例的模型名称。
@@ -15,13 +15,19 @@ This design enables:
 - Uniform safety classification
 """
 
-from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, Optional, Type, TypeVar, Generic
+from typing import Any, Callable, Dict, Optional, Type, TypeVar, Generic
 from pydantic import BaseModel, Field
+import copy
+import json
 import time
 import logging
 
+try:  # 可选依赖：orjson 序列化比标准库 json 快数倍
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure module logger
 logger = logging.getLogger("jarvis.tools")
 
@@ -39,6 +45,71 @@ class RiskLevel(str, Enum):
     DANGEROUS = "dangerous"
 
 
+def _dumps(obj: Any) -> str:
+    """Pretty-print data as JSON (orjson when available, stdlib json otherwise)."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # 例如超出 64 位的整数：交给标准库处理
+    return json.dumps(obj, ensure_ascii=False, indent=2)
+
+
+# === to_natural_language formatters for well-known data keys ===
+# 每个函数返回 None 表示不适用（继续尝试下一个）
+
+def _format_stdout(data: Dict[str, Any]) -> Optional[str]:
+    output = data.get("stdout", "(无输出)")
+    if data.get("generated_files"):
+        output += f"\n生成文件: {', '.join(data['generated_files'])}"
+    return output
+
+
+def _format_output(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("output", "(无输出)")
+
+
+def _format_result_item(i: int, r: Any) -> str:
+    if isinstance(r, dict):
+        # 短 snippet 切片本身就返回原对象，不会复制
+        return f"【{i}】{r.get('title', '无标题')}\n{r.get('snippet', '')[:200]}"
+    return f"【{i}】{r}\n"
+
+
+def _format_results(data: Dict[str, Any]) -> Optional[str]:
+    """搜索结果"""
+    results = data["results"]
+    if not (isinstance(results, list) and results):
+        return None
+    return "\n\n".join(_format_result_item(i, r) for i, r in enumerate(results[:5], 1))
+
+
+def _format_time(data: Dict[str, Any]) -> Optional[str]:
+    return f"当前时间: {data.get('datetime', data.get('time'))}"
+
+
+def _format_weather(data: Dict[str, Any]) -> Optional[str]:
+    return data.get("weather", str(data))
+
+
+def _format_raw_content(data: Dict[str, Any]) -> Optional[str]:
+    if "query" not in data:
+        return None
+    return data.get("raw_content", "(无内容)")
+
+
+# 按优先级排列；"datetime" 与 "time" 共用同一格式化函数
+_FORMATTERS: tuple[tuple[str, Callable[[Dict[str, Any]], Optional[str]]], ...] = (
+    ("stdout", _format_stdout),
+    ("output", _format_output),
+    ("results", _format_results),
+    ("datetime", _format_time),
+    ("time", _format_time),
+    ("weather", _format_weather),
+    ("raw_content", _format_raw_content),
+)
+
+
 class ToolResult(BaseModel):
     """
     Standardized tool execution result.
@@ -56,6 +127,20 @@ class ToolResult(BaseModel):
     execution_time_ms: Optional[float] = None
     metadata: Dict[str, Any] = Field(default_factory=dict)
     
+    @classmethod
+    def ok(cls, data: Any = None, execution_time_ms: Optional[float] = None) -> "ToolResult":
+        """Fast success result: clones a prebuilt prototype instead of running validation."""
+        return _SUCCESS_PROTO.model_copy(
+            update={"data": data, "execution_time_ms": execution_time_ms, "metadata": {}}
+        )
+    
+    @classmethod
+    def fail(cls, error: str, execution_time_ms: Optional[float] = None) -> "ToolResult":
+        """Fast failure result: clones a prebuilt prototype instead of running validation."""
+        return _FAILURE_PROTO.model_copy(
+            update={"error": error, "execution_time_ms": execution_time_ms, "metadata": {}}
+        )
+    
     def to_natural_language(self) -> str:
         """Format result for LLM consumption with intelligent formatting."""
         if self.success:
@@ -63,43 +148,40 @@ class ToolResult(BaseModel):
                 return "操作已成功完成。"
             
             if isinstance(self.data, dict):
-                # 智能格式化结构化数据
-                if "stdout" in self.data:
-                    output = self.data.get("stdout", "(无输出)")
-                    if self.data.get("generated_files"):
-                        output += f"\n生成文件: {', '.join(self.data['generated_files'])}"
-                    return output
-                if "output" in self.data:
-                    return self.data.get("output", "(无输出)")
-                if "results" in self.data:  # 搜索结果
-                    results = self.data["results"]
-                    if isinstance(results, list) and results:
-                        formatted = []
-                        for i, r in enumerate(results[:5], 1):
-                            title = r.get("title", "无标题") if isinstance(r, dict) else str(r)
-                            snippet = r.get("snippet", "")[:200] if isinstance(r, dict) else ""
-                            formatted.append(f"【{i}】{title}\n{snippet}")
-                        return "\n\n".join(formatted)
-                if "time" in self.data or "datetime" in self.data:
-                    return f"当前时间: {self.data.get('datetime', self.data.get('time'))}"
-                if "weather" in self.data:
-                    return self.data.get("weather", str(self.data))
-                if "query" in self.data and "raw_content" in self.data:
-                    return self.data.get("raw_content", "(无内容)")
+                # 智能格式化结构化数据：按优先级查表，命中且有结果即返回
+                data = self.data
+                for key, formatter in _FORMATTERS:
+                    if key in data:
+                        text = formatter(data)
+                        if text is not None:
+                            return text
                 # 默认: 格式化为可读文本
-                import json
-                return json.dumps(self.data, ensure_ascii=False, indent=2)
+                return _dumps(self.data)
             
             return str(self.data)
         else:
             return f"执行失败：{self.error}"
 
 
+# Prototypes for ToolResult.ok() / fail(); model_copy() is shallow, so each
+# clone gets its own metadata dict instead of sharing the prototype's.
+_SUCCESS_PROTO = ToolResult.model_construct(
+    success=True, data=None, error=None, execution_time_ms=None, metadata={}
+)
+_FAILURE_PROTO = ToolResult.model_construct(
+    success=False, data=None, error=None, execution_time_ms=None, metadata={}
+)
+
+
+# to_openai_tools() results keyed by the tuple of tool classes (schemas are per class)
+_OPENAI_TOOLS_CACHE: dict[tuple[type, ...], list[Dict[str, Any]]] = {}
+
+
 # Type variable for InputSchema
 TInput = TypeVar("TInput", bound=BaseModel)
 
 
-class BaseTool(ABC, Generic[TInput]):
+class BaseTool(Generic[TInput]):
     """
     Abstract base class for all Jarvis tools.
     
@@ -110,8 +192,12 @@ class BaseTool(ABC, Generic[TInput]):
     - InputSchema: Pydantic model for input validation
     - execute(): Core tool logic
     
+    Instances use __slots__; subclasses should declare ``__slots__ = ()``
+    (or their own slot names) to stay free of a per-instance __dict__.
+    
     Example:
         class GetTimeTool(BaseTool[GetTimeInput]):
+            __slots__ = ()
             name = "get_current_time"
             description = "获取当前系统时间"
             risk_level = RiskLevel.SAFE
@@ -121,6 +207,8 @@ class BaseTool(ABC, Generic[TInput]):
                 return ToolResult(success=True, data=datetime.now().isoformat())
     """
     
+    __slots__ = ("_validate", "_construct", "_is_empty_schema")
+    
     # === Required Metadata (must be overridden) ===
     name: str = ""
     description: str = ""
@@ -132,10 +220,45 @@ class BaseTool(ABC, Generic[TInput]):
     author: str = "Jarvis Team"
     tags: list[str] = []
     
+    # pydantic-core SchemaValidator of InputSchema and its bound validate_python,
+    # captured at class creation (a builtin bound method: no re-binding on access)
+    _validator: Any = None
+    _pyd_validate: Optional[Callable[[Any], Any]] = None
+    # OpenAI "parameters" schema of InputSchema ($refs inlined), built at class creation
+    _openai_parameters: Optional[Dict[str, Any]] = None
+    
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Build the InputSchema validator and OpenAI parameters when the tool class is defined."""
+        super().__init_subclass__(**kwargs)
+        # 代替 ABC：在类定义时（而非每次实例化时）检查具体工具是否实现了 execute
+        if cls.InputSchema is not None and cls.execute is BaseTool.execute:
+            raise TypeError(f"{cls.__name__} must implement execute()")
+        schema = cls.__dict__.get("InputSchema")
+        if schema is None:
+            return
+        # 校验器构建放在导入期，避免首个用户请求承担这部分冷启动开销
+        if schema.model_config.get("defer_build"):
+            schema.model_config["defer_build"] = False
+        if schema.model_rebuild(force=False, raise_errors=False) is not False:
+            cls._validator = schema.__pydantic_validator__
+            cls._pyd_validate = cls._validator.validate_python
+            # schema 在运行期不变：$ref 内联只在定义时做一次
+            cls._openai_parameters = cls._build_parameters(schema)
+        else:
+            cls._validator = cls._pyd_validate = None
+            cls._openai_parameters = None
+    
     def __init__(self):
         """Initialize the tool and validate metadata."""
         self._validate_metadata()
-        logger.debug(f"Tool initialized: {self.name} (risk={self.risk_level.value})")
+        # 预绑定 schema 方法，省去每次调用的属性查找；
+        # 有已构建的校验器时直接调用 validate_python，绕过 model_validate 包装
+        self._validate = self._pyd_validate or self.InputSchema.model_validate
+        self._construct = self.InputSchema.model_construct
+        # 无参数工具（EmptyInput 或无字段的 schema）可跳过 Pydantic 校验
+        self._is_empty_schema = self.InputSchema is EmptyInput or not self.InputSchema.model_fields
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Tool initialized: %s (risk=%s)", self.name, self.risk_level.value)
     
     def _validate_metadata(self) -> None:
         """Ensure required metadata is properly defined."""
@@ -146,7 +269,6 @@ class BaseTool(ABC, Generic[TInput]):
         if self.InputSchema is None:
             raise ValueError(f"{self.__class__.__name__} must define 'InputSchema' class attribute")
     
-    @abstractmethod
     def execute(self, params: TInput) -> ToolResult:
         """
         Execute the tool with validated parameters.
@@ -161,8 +283,12 @@ class BaseTool(ABC, Generic[TInput]):
             This method should NOT handle exceptions internally (except for
             expected business logic errors). Let the ToolExecutor middleware
             handle unexpected exceptions for consistent error formatting.
+            
+            Protocol method: concrete tools (those with an InputSchema) must
+            override it, which BaseTool.__init_subclass__ enforces at class
+            definition.
         """
-        pass
+        ...
     
     def validate_input(self, raw_input: Dict[str, Any]) -> TInput:
         """
@@ -177,7 +303,7 @@ class BaseTool(ABC, Generic[TInput]):
         Raises:
             pydantic.ValidationError: If validation fails
         """
-        return self.InputSchema.model_validate(raw_input)
+        return self._validate(raw_input)
     
     def run(self, raw_input: Dict[str, Any]) -> ToolResult:
         """
@@ -192,18 +318,20 @@ class BaseTool(ABC, Generic[TInput]):
         Returns:
             ToolResult from execution
         """
-        start_time = time.perf_counter()
+        start_ns = time.perf_counter_ns()
         try:
-            params = self.validate_input(raw_input)
+            if self._is_empty_schema and not raw_input:
+                # Fast path: nothing to validate. model_construct() skips validation
+                # entirely, which is only safe because there are no fields to check.
+                params = self._construct()
+            else:
+                params = self.validate_input(raw_input)
             result = self.execute(params)
-            result.execution_time_ms = (time.perf_counter() - start_time) * 1000
+            # execute() 返回的是工具自己构造的结果，这里直接写入耗时而不是再复制一份
+            result.execution_time_ms = (time.perf_counter_ns() - start_ns) * 1e-6
             return result
         except Exception as e:
-            return ToolResult(
-                success=False,
-                error=str(e),
-                execution_time_ms=(time.perf_counter() - start_time) * 1000
-            )
+            return ToolResult.fail(str(e), (time.perf_counter_ns() - start_ns) * 1e-6)
     
     # === OpenAI Function Calling Schema Generation ===
     
@@ -211,6 +339,10 @@ class BaseTool(ABC, Generic[TInput]):
         """
         Generate OpenAI-compatible function calling schema.
         
+        name / description / InputSchema are class-level constants, so the
+        assembled schema is cached on the tool class and shared by all
+        instances (treat it as read-only).
+        
         Returns:
             Dictionary conforming to OpenAI's function calling format:
             {
@@ -222,8 +354,39 @@ class BaseTool(ABC, Generic[TInput]):
                 }
             }
         """
+        cls = type(self)
+        cached = cls.__dict__.get("__openai_schema_cache__")
+        if cached is not None:
+            return cached
+        
+        if cls._openai_parameters is None:
+            cls._openai_parameters = cls._build_parameters(self.InputSchema)
+        
+        schema = {
+            "type": "function",
+            "function": {
+                "name": self.name,
+                "description": self.description,
+                "parameters": cls._openai_parameters,
+            }
+        }
+        # 缓存在类上（而非实例），同类工具的所有实例共享
+        cls.__openai_schema_cache__ = schema
+        return schema
+    
+    @classmethod
+    def invalidate_openai_schema(cls) -> None:
+        """Drop the cached schema (e.g. after changing name/description/InputSchema)."""
+        if "__openai_schema_cache__" in cls.__dict__:
+            delattr(cls, "__openai_schema_cache__")
+        cls._openai_parameters = None
+        _OPENAI_TOOLS_CACHE.clear()
+    
+    @staticmethod
+    def _build_parameters(input_schema: Type[BaseModel]) -> Dict[str, Any]:
+        """Turn an InputSchema into an OpenAI-compatible 'parameters' JSON schema."""
         # Get JSON schema from Pydantic model
-        json_schema = self.InputSchema.model_json_schema()
+        json_schema = input_schema.model_json_schema()
         
         # Clean up schema for OpenAI compatibility
         # Remove 'title' from root (OpenAI doesn't need it)
@@ -235,43 +398,53 @@ class BaseTool(ABC, Generic[TInput]):
         
         # Handle $defs (Pydantic v2 nested models) - inline them
         if "$defs" in json_schema:
-            json_schema = self._inline_refs(json_schema)
+            json_schema = BaseTool._inline_refs(json_schema)
         
-        return {
-            "type": "function",
-            "function": {
-                "name": self.name,
-                "description": self.description,
-                "parameters": json_schema
-            }
-        }
+        return json_schema
     
-    def _inline_refs(self, schema: Dict[str, Any]) -> Dict[str, Any]:
+    @staticmethod
+    def _inline_refs(schema: Dict[str, Any]) -> Dict[str, Any]:
         """
-        Recursively inline $ref definitions for OpenAI compatibility.
+        Inline $ref definitions for OpenAI compatibility (in place).
         
         OpenAI function calling doesn't support JSON Schema $ref,
         so we need to inline all referenced definitions.
+        
+        Iterative walk with an explicit stack. Every reference site gets its own
+        deep copy of the definition, so callers may mutate the result safely. A
+        reference back to a definition already being expanded on the current path
+        (self-referential model) is replaced with a plain object schema instead of
+        producing a cyclic dict. The input schema must be a fresh dict
+        (model_json_schema() returns one per call).
         """
         defs = schema.pop("$defs", {})
+        for definition in defs.values():
+            definition.pop("title", None)
         
-        def resolve_refs(obj: Any) -> Any:
-            if isinstance(obj, dict):
-                if "$ref" in obj:
-                    ref_path = obj["$ref"]  # e.g., "#/$defs/MyModel"
-                    ref_name = ref_path.split("/")[-1]
-                    if ref_name in defs:
-                        # Replace $ref with actual definition
-                        resolved = defs[ref_name].copy()
-                        resolved.pop("title", None)
-                        return resolve_refs(resolved)
-                    return obj
-                return {k: resolve_refs(v) for k, v in obj.items()}
-            elif isinstance(obj, list):
-                return [resolve_refs(item) for item in obj]
-            return obj
+        # 栈元素：(容器, 当前路径上正在展开的定义名)，用于检测递归引用
+        stack: list[tuple[Any, frozenset[str]]] = [(schema, frozenset())]
+        while stack:
+            node, expanding = stack.pop()
+            # 只替换已有键/下标的值，不改变容器大小，可边遍历边写
+            items = node.items() if isinstance(node, dict) else enumerate(node)
+            for key, child in items:
+                if isinstance(child, dict):
+                    ref = child.get("$ref")  # e.g., "#/$defs/MyModel"
+                    if ref is not None:
+                        name = ref.rsplit("/", 1)[-1]
+                        if name in defs:
+                            if name in expanding:
+                                node[key] = {"type": "object"}
+                                continue
+                            # Replace $ref with an independent copy of the definition
+                            resolved = node[key] = copy.deepcopy(defs[name])
+                            stack.append((resolved, expanding | {name}))
+                            continue
+                    stack.append((child, expanding))
+                elif isinstance(child, list):
+                    stack.append((child, expanding))
         
-        return resolve_refs(schema)
+        return schema
     
     @classmethod
     def to_openai_tools(cls, tools: list["BaseTool"]) -> list[Dict[str, Any]]:
@@ -282,9 +455,17 @@ class BaseTool(ABC, Generic[TInput]):
             tools: List of BaseTool instances
             
         Returns:
-            List of OpenAI function schemas
+            List of OpenAI function schemas. The list is memoized per sequence of
+            tool classes and shared between calls (treat it as read-only).
         """
-        return [tool.to_openai_schema() for tool in tools]
+        key = tuple(type(tool) for tool in tools)
+        cached = _OPENAI_TOOLS_CACHE.get(key)
+        if cached is None:
+            cached = _OPENAI_TOOLS_CACHE[key] = [
+                type(tool).__dict__.get("__openai_schema_cache__") or tool.to_openai_schema()
+                for tool in tools
+            ]
+        return cached
     
     # === Utility Methods ===
     
@@ -307,6 +488,13 @@ class EmptyInput(BaseModel):
 if __name__ == "__main__":
     # Demonstration of how to create a tool
     from datetime import datetime
+    from functools import lru_cache
+    from zoneinfo import ZoneInfo
+    
+    @lru_cache(maxsize=64)
+    def _zone(name: str) -> ZoneInfo:
+        """Parsed tzdata per timezone name (import and parse once, not per call)."""
+        return ZoneInfo(name)
     
     class GetTimeInput(BaseModel):
         """Input for GetTimeTool."""
@@ -316,6 +504,7 @@ if __name__ == "__main__":
         )
     
     class GetTimeTool(BaseTool[GetTimeInput]):
+        __slots__ = ()
         name = "get_current_time"
         description = "获取当前时间，支持指定时区"
         risk_level = RiskLevel.SAFE
@@ -324,12 +513,11 @@ if __name__ == "__main__":
         
         def execute(self, params: GetTimeInput) -> ToolResult:
             try:
-                from zoneinfo import ZoneInfo
-                tz = ZoneInfo(params.timezone)
+                tz = _zone(params.timezone)
                 current_time = datetime.now(tz).strftime("%Y-%m-%d %H:%M:%S %Z")
-                return ToolResult(success=True, data=current_time)
-            except Exception as e:
-                return ToolResult(success=False, error=f"时区无效: {params.timezone}")
+                return ToolResult.ok(current_time)
+            except Exception:
+                return ToolResult.fail(f"时区无效: {params.timezone}")
     
     # Test the tool
     tool = GetTimeTool()
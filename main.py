@@ -24,9 +24,12 @@ import os
 import io
 import argparse
 import logging
+import logging.handlers
+import queue
+import atexit
 import warnings
 from pathlib import Path
-from typing import Optional, Callable, Any
+from typing import Optional, Callable, Any, cast
 
 # ==================== 环境修复 ====================
 reconfigure = getattr(sys.stdout, "reconfigure", None)
@@ -52,6 +55,16 @@ logging.getLogger("openai").setLevel(logging.WARNING)
 logging.getLogger("chromadb").setLevel(logging.WARNING)
 logging.getLogger("faster_whisper").setLevel(logging.WARNING)
 
+# 实际的日志输出交给后台线程：事件循环里只做入队，终端/文件写入不会阻塞 asyncio
+_root_logger = logging.getLogger()
+_log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+_log_listener = logging.handlers.QueueListener(
+    _log_queue, *_root_logger.handlers, respect_handler_level=True
+)
+_root_logger.handlers = [logging.handlers.QueueHandler(_log_queue)]
+_log_listener.start()
+atexit.register(_log_listener.stop)
+
 logger = logging.getLogger(__name__)
 
 # ==================== Rich UI ====================
@@ -77,8 +90,7 @@ from langchain_core.runnables import RunnableConfig
 from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
 
 from config import Config
-from core.graph.builder import create_graph, check_tool_calls_safety, get_tool_by_name
-from core.graph.state import AgentState
+from core.graph.builder import create_graph, check_tool_calls_safety, get_tool_by_name, prewarm, aprewarm_connections
 from core.llm_provider import RoleType, LLMFactory
 from services.memory_service import MemoryService
 from tools.role import ROLE_SWITCH_MARKER
@@ -227,7 +239,7 @@ async def run_graph_with_safety(
     # Build initial state with interaction_mode
     # Cast interaction_mode to Literal type
     mode: InteractionMode = "voice" if interaction_mode == "voice" else "text"
-    state: AgentState = {
+    state: dict[str, Any] = {
         "messages": messages.copy(),
         "current_role": role,
         "interaction_mode": mode,
@@ -235,7 +247,7 @@ async def run_graph_with_safety(
     }
     
     # Track if we're resuming from interrupt (use None to resume from checkpoint)
-    current_input: Optional[AgentState] = state
+    current_input: Optional[dict[str, Any]] = state
     
     while True:
         # Stream until we hit an interrupt or finish
@@ -313,7 +325,7 @@ async def run_graph_with_safety(
                             continue
         
         # Unknown interrupt state
-        logger.warning(f"Unknown interrupt state: {graph_state.next}")
+        logger.warning("Unknown interrupt state: %s", graph_state.next)
         break
     
     # Get final messages
@@ -344,6 +356,16 @@ def main():
     Config.setup_env_proxy()
     ensure_data_dir()
     
+    # Validate LLM role config up front so misconfiguration fails before any API call
+    try:
+        Config.LLM_ROLES
+    except ValueError as e:
+        console.print(f"[error]LLM 角色配置错误: {e}[/error]")
+        return
+    
+    # Warm the selected role's LLM in the background while services initialize
+    prewarm(cast(RoleType, args.role))
+    
     # Display banner
     mode_str = "文字模式" if args.text else "语音模式"
     safety_str = "禁用" if args.no_safety else "启用"
@@ -443,6 +465,7 @@ async def run_main_loop(args, ear_mouth, wake_word, scheduler):
     
     checkpointer_cm = None  # Context manager
     checkpointer = None     # Actual saver instance
+    warmup_task: Optional[asyncio.Task] = None
     try:
         checkpointer_cm = AsyncSqliteSaver.from_conn_string(str(STATE_DB_PATH))
         checkpointer = await checkpointer_cm.__aenter__()
@@ -452,6 +475,8 @@ async def run_main_loop(args, ear_mouth, wake_word, scheduler):
             checkpointer=checkpointer,
             interrupt_before_tools=not args.no_safety,
         )
+        # 在主事件循环上预先建立 LLM 长连接（异步连接池绑定在当前 loop 上）
+        warmup_task = asyncio.create_task(aprewarm_connections(cast(RoleType, current_role)))
         
         thread_id = "jarvis-main-thread"
         thread_config: RunnableConfig = {"configurable": {"thread_id": thread_id}}
@@ -707,7 +732,16 @@ async def run_main_loop(args, ear_mouth, wake_word, scheduler):
                 console.print("[dim]正在保存会话状态...[/dim]")
                 await checkpointer_cm.__aexit__(None, None, None)
             except Exception as e:
-                logger.debug(f"Checkpointer cleanup: {e}")
+                logger.debug("Checkpointer cleanup: %s", e)
+        # 预热可能仍在使用共享客户端：先取消并等待其结束，再关闭连接池
+        if warmup_task is not None and not warmup_task.done():
+            warmup_task.cancel()
+            try:
+                await warmup_task
+            except asyncio.CancelledError:
+                pass
+        # 关闭 LLM 客户端的连接池（异步客户端需在当前事件循环内关闭）
+        await LLMFactory.aclose()
 
 
 if __name__ == "__main__":
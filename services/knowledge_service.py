@@ -119,7 +119,7 @@ class KnowledgeService:
                     with open(file_path, "r", encoding="gbk") as f:
                         content = f.read()
         except Exception as e:
-            logger.error(f"Error reading file {file_path}: {e}")
+            logger.error("Error reading file %s: %s", file_path, e)
             return None
             
         return content
@@ -145,10 +145,10 @@ class KnowledgeService:
         if existing and existing['metadatas']:
             stored_hash = existing['metadatas'][0].get('hash')
             if stored_hash == file_hash:
-                logger.info(f"File skipped (unchanged): {file_path}")
+                logger.info("File skipped (unchanged): %s", file_path)
                 return "文件未变更，已跳过。"
             else:
-                logger.info(f"File changed, re-indexing: {file_path}")
+                logger.info("File changed, re-indexing: %s", file_path)
                 # 只有内容变了才删除旧的
                 self.collection.delete(where={"source": file_path})
 
@@ -172,7 +172,7 @@ class KnowledgeService:
 
         # 5. Embedding
         # 这一步最耗时，打印日志提示用户
-        logger.info(f"Embedding {len(chunks)} chunks for {file_path}...")
+        logger.info("Embedding %d chunks for %s...", len(chunks), file_path)
         embeddings = self.model.encode(chunks).tolist()
 
         # 6. 存储
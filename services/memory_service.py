@@ -62,7 +62,7 @@ class MemoryService:
                 with open(self.file_path, "w", encoding="utf-8") as f:
                     json.dump(self.profile, f, ensure_ascii=False, indent=2)
             except Exception as e:
-                logger.error(f"[Memory Error] Save failed: {e}")
+                logger.error("[Memory Error] Save failed: %s", e)
 
     def update_profile(self, key, value):
         """更新根字段或 preferences"""
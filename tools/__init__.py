@@ -10,6 +10,8 @@ V7.0 Native Tools:
 - Risk level attributes for safety routing
 """
 
+from functools import lru_cache
+
 # ============== V7.0 Native Tools ==============
 # These are the only tools used in the current system
 
@@ -52,14 +54,27 @@ def get_native_tools():
     return NATIVE_TOOLS.copy()
 
 
+@lru_cache(maxsize=1)
+def _partition_native_tools():
+    """Split NATIVE_TOOLS into (safe, dangerous) tuples in a single pass."""
+    safe, dangerous = [], []
+    for t in NATIVE_TOOLS:
+        level = get_tool_risk_level(t)
+        if level == "safe":
+            safe.append(t)
+        elif level == "dangerous":
+            dangerous.append(t)
+    return tuple(safe), tuple(dangerous)
+
+
 def get_safe_native_tools():
-    """Get native tools with risk_level == 'safe'."""
-    return [t for t in NATIVE_TOOLS if get_tool_risk_level(t) == "safe"]
+    """Get native tools with risk_level == 'safe' (shared tuple)."""
+    return _partition_native_tools()[0]
 
 
 def get_dangerous_native_tools():
-    """Get native tools with risk_level == 'dangerous'."""
-    return [t for t in NATIVE_TOOLS if get_tool_risk_level(t) == "dangerous"]
+    """Get native tools with risk_level == 'dangerous' (shared tuple)."""
+    return _partition_native_tools()[1]
 
 
 # ============== Exports ==============
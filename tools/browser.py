@@ -169,14 +169,14 @@ async def _run_browser_task(task: str, timeout: int = BROWSER_TASK_TIMEOUT) -> s
         )
         
         # Execute task with timeout protection
-        logger.info(f"Starting browser task with {timeout}s timeout: {task[:50]}...")
+        logger.info("Starting browser task with %ss timeout: %.50s...", timeout, task)
         result = await asyncio.wait_for(agent.run(), timeout=timeout)
         final = result.final_result()
         
         return final if final is not None else "任务已完成，但没有返回具体内容。"
     
     except asyncio.TimeoutError:
-        logger.warning(f"Browser task timed out after {timeout}s")
+        logger.warning("Browser task timed out after %ss", timeout)
         return f"浏览器任务超时（{timeout}秒）。请尝试简化任务或稍后重试。"
         
     except Exception as e:
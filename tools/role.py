@@ -66,6 +66,16 @@ ROLE_ALIASES = {
     "图片": "vision",
 }
 
+# Human-readable role descriptions (module-level, built once)
+_ROLE_DESCRIPTIONS = {
+    "default": "默认模式 - 平衡的通用对话能力",
+    "smart": "高智能模式 - GPT-4o，适合复杂推理和创意任务",
+    "coder": "编程模式 - DeepSeek-Coder，优化的代码生成能力",
+    "fast": "快速模式 - Llama3，本地运行，响应迅速",
+    "vision": "视觉模式 - Gemini，支持图像分析和多模态理解",
+}
+_UNKNOWN_ROLE_DESCRIPTION = "未知模式"
+
 
 # ============== Input Schema ==============
 
@@ -104,14 +114,7 @@ def get_role_description(role: str) -> str:
     try:
         from typing import cast
         role_info = LLMFactory.get_role_info(cast(RoleType, role))
-        descriptions = {
-            "default": "默认模式 - 平衡的通用对话能力",
-            "smart": "高智能模式 - GPT-4o，适合复杂推理和创意任务",
-            "coder": "编程模式 - DeepSeek-Coder，优化的代码生成能力",
-            "fast": "快速模式 - Llama3，本地运行，响应迅速",
-            "vision": "视觉模式 - Gemini，支持图像分析和多模态理解",
-        }
-        desc = descriptions.get(role, "未知模式")
+        desc = _ROLE_DESCRIPTIONS.get(role, _UNKNOWN_ROLE_DESCRIPTION)
         return f"{desc}\n[Provider: {role_info['provider']}, Model: {role_info['model']}]"
     except Exception:
         return f"角色: {role}"
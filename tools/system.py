@@ -61,6 +61,31 @@ APP_MAP = {
     "qq": "qq"
 }
 
+# Pre-lowered lookup table, built once so volume calls don't re-lower per session
+_APP_MAP_LOWER = {k.lower(): v.lower() for k, v in APP_MAP.items()}
+
+# Single alternation regex over app names, wrapped in a lookahead so finditer
+# reports every (overlapping) key occurrence. Longest-first ordering only breaks
+# ties between keys starting at the same position.
+_APP_NAME_RE = re.compile(
+    "(?=(" + "|".join(re.escape(k) for k in sorted(_APP_MAP_LOWER, key=len, reverse=True)) + "))"
+)
+
+
+def _resolve_app_process(app_name: str) -> str:
+    """
+    Resolve a (possibly verbose) app name like '网易云音乐' to its process keyword.
+    
+    A substring match is only used when every key found maps to the same
+    process; an ambiguous name such as 'QQ音乐' ("qq" vs "音乐") is kept as is.
+    """
+    app_key = app_name.lower()
+    process = _APP_MAP_LOWER.get(app_key)
+    if process is not None:
+        return process
+    candidates = {_APP_MAP_LOWER[m.group(1)] for m in _APP_NAME_RE.finditer(app_key)}
+    return candidates.pop() if len(candidates) == 1 else app_key
+
 _com_initialized = False
 
 
@@ -101,10 +126,10 @@ def _get_master_volume_ctrl():
 
 def _set_master_volume(val: int) -> str:
     """Set master volume (0-100)."""
+    val = max(0, min(100, val))
     try:
         volume = _get_master_volume_ctrl()
-        scalar = max(0.0, min(1.0, val / 100.0))
-        volume.SetMasterVolumeLevelScalar(scalar, None)
+        volume.SetMasterVolumeLevelScalar(val / 100.0, None)
         return f"主音量已调整为 {val}%"
     except Exception as e:
         return f"调整主音量失败: {e}"
@@ -115,7 +140,9 @@ def _set_app_volume(app_name: str, val: int) -> str:
     _init_com()
     from pycaw.pycaw import AudioUtilities
     
-    target_process = APP_MAP.get(app_name.lower(), app_name).lower()
+    target_process = _resolve_app_process(app_name)
+    val = max(0, min(100, val))
+    scalar = val / 100.0
     found = False
     
     try:
@@ -125,9 +152,10 @@ def _set_app_volume(app_name: str, val: int) -> str:
                 continue
             
             proc_name = session.Process.name().lower()
-            if target_process in proc_name.replace(".exe", ""):
+            if proc_name.endswith(".exe"):
+                proc_name = proc_name[:-4]
+            if target_process in proc_name:
                 interface = session.SimpleAudioVolume
-                scalar = max(0.0, min(1.0, val / 100.0))
                 interface.SetMasterVolume(scalar, None)
                 found = True
         
@@ -152,6 +180,7 @@ def _adjust_volume_step(step: int) -> str:
 
 def _set_brightness(val: int) -> str:
     """Set screen brightness (0-100)."""
+    val = max(0, min(100, val))
     try:
         import screen_brightness_control as sbc
         sbc.set_brightness(val)
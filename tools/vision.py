@@ -26,11 +26,24 @@ from typing import Optional
 
 from pydantic import BaseModel, Field
 from langchain_core.tools import tool
-from langchain_core.messages import HumanMessage
+from langchain_core.messages import HumanMessage, SystemMessage
 
 logger = logging.getLogger(__name__)
 
 
+# 视觉分析的系统提示：强制简洁（因为这个结果会被朗读或转述）
+# 作为模块常量复用：Gemini 会把它作为固定的 system_instruction 发送，前缀不变，不必每次重建
+_VISION_SYSTEM_MESSAGE = SystemMessage(content=(
+    "你是一个视觉分析助手。直接描述你看到的内容，不要废话。"
+    "规则："
+    "1-2句话概括重点，不要长篇大论；"
+    "不要说'我看到'这种开头，直接说内容；"
+    "不要过度分析或推测用户意图；"
+    "不要反问用户。"
+    "示例回答：'VS Code 打开了 main.py，正在调试 Python 程序。'"
+))
+
+
 # ============== Input Schema ==============
 
 class VisionAnalyzeInput(BaseModel):
@@ -78,14 +91,15 @@ def capture_screen() -> Optional[str]:
         # Encode to base64
         base64_str = base64.b64encode(image_bytes).decode('utf-8')
         
-        logger.debug(f"Screenshot captured: {len(base64_str)} bytes (base64)")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Screenshot captured: %d bytes (base64)", len(base64_str))
         return base64_str
         
     except ImportError as e:
-        logger.error(f"Missing dependency for screenshot: {e}")
+        logger.error("Missing dependency for screenshot: %s", e)
         return None
     except Exception as e:
-        logger.error(f"Screenshot capture failed: {e}")
+        logger.error("Screenshot capture failed: %s", e)
         return None
 
 
@@ -104,26 +118,14 @@ def analyze_image_with_llm(base64_image: str, query: str) -> str:
         LLM's analysis response text
     """
     from core.llm_provider import LLMFactory
-    from langchain_core.messages import SystemMessage
     
     try:
         # Get vision-capable LLM
         llm = LLMFactory.create("vision")
         
-        # System prompt: 强制简洁（因为这个结果会被朗读或转述）
-        system_prompt = (
-            "你是一个视觉分析助手。直接描述你看到的内容，不要废话。"
-            "规则："
-            "1-2句话概括重点，不要长篇大论；"
-            "不要说'我看到'这种开头，直接说内容；"
-            "不要过度分析或推测用户意图；"
-            "不要反问用户。"
-            "示例回答：'VS Code 打开了 main.py，正在调试 Python 程序。'"
-        )
-        
         # Construct multi-modal message (compatible with both OpenAI and Gemini)
         messages = [
-            SystemMessage(content=system_prompt),
+            _VISION_SYSTEM_MESSAGE,
             HumanMessage(
                 content=[
                     {"type": "text", "text": query},
@@ -148,7 +150,7 @@ def analyze_image_with_llm(base64_image: str, query: str) -> str:
         return str(response)
         
     except Exception as e:
-        logger.error(f"Vision LLM analysis failed: {e}")
+        logger.error("Vision LLM analysis failed: %s", e)
         return f"视觉分析出错：{e}"
 
 
@@ -176,7 +178,7 @@ def vision_analyze(query: str = "描述当前屏幕内容") -> str:
     Returns:
         AI 对屏幕内容的分析结果
     """
-    logger.info(f"Vision analyze requested: {query}")
+    logger.info("Vision analyze requested: %s", query)
     
     # Step 1: Capture screen
     base64_image = capture_screen()
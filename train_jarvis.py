@@ -38,7 +38,7 @@ def train():
     console.print(f"[info]扫描到 {len(files_to_process)} 个核心文件，准备开始注入知识库...[/info]")
 
     # 2. 批量处理
-    start_time = time.time()
+    start_time = time.perf_counter()
     success_count = 0
     
     # 使用 rich 的进度条
@@ -51,7 +51,7 @@ def train():
         except Exception as e:
             console.print(f"[red]处理 {os.path.basename(file_path)} 失败: {e}[/red]")
 
-    end_time = time.time()
+    end_time = time.perf_counter()
     duration = end_time - start_time
 
     console.print(f"\n[bold green]✨ 训练完成！[/bold green]")